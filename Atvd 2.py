@@ -1,26 +1,16 @@
-import os
-import zipfile as zip
+from contador_textos import conta_pasta_incremental, escreve_resultado, zipa_resultado
 
 # Lendo o diretorio
 path = './Textos/'
+# True lê cada arquivo em blocos mapeados em memória (para textos grandes); a contagem é a mesma nos dois modos
+usar_mmap = False
 
-# Criando arquivo de resultado
-open('./resultado.txt', 'w')
-for files in os.scandir('./Textos'):
-  with open(path + files.name, 'r') as file:
-    # Contando a qntd de palavras e letras
-    countWords = 0
-    countLetters = 0
-    for line in file:
-      if(not line.isspace()):
-        for word in line.split():
-          countWords += 1
-          for letters in word:
-            countLetters += 1
-    # Imprindo resultado
-    with open('resultado.txt', 'a') as file:
-      print(f'Arquivo: {files.name} - Palavras: {countWords} - Letras: {countLetters} \n', file=file)
+if __name__ == '__main__':
+  # Contando a qntd de palavras e letras em paralelo, só dos arquivos novos ou alterados
+  resultados = conta_pasta_incremental(path, usar_mmap=usar_mmap)
 
-# Criando arquivo zipado
-with zip.ZipFile('saida.zip', 'w') as zipper:
-    zipper.write('resultado.txt')
\ No newline at end of file
+  # Imprindo resultado de uma vez
+  escreve_resultado(resultados, 'resultado.txt')
+
+  # Criando arquivo zipado direto a partir dos resultados
+  zipa_resultado(resultados, 'saida.zip', compressao='deflate')
\ No newline at end of file
@@ -1,10 +1,18 @@
 from http import HTTPStatus
-from fastapi import FastAPI, HTTPException
-from pydantic import BaseModel
+from fastapi import FastAPI, HTTPException, Query, Request
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import StreamingResponse
+from pydantic import BaseModel, TypeAdapter, ValidationError
+from typing import List, Optional
+import base64
+import binascii
 import json
-import xml.etree.ElementTree as ET
+import os
+from repositorio_livros import abre_armazenamento, valida_ordem
 
 app = FastAPI()
+# LIVROS_ARMAZENAMENTO=sqlite troca o livros.xml pelo banco livros.db
+repositorio = abre_armazenamento(os.environ.get('LIVROS_ARMAZENAMENTO', 'xml'), os.environ.get('LIVROS_ARQUIVO'))
 
 class Livro(BaseModel):
     id: int
@@ -13,72 +21,144 @@ class Livro(BaseModel):
     ano: int
     genero: str
 
-def valida_id(id, tree):
+LivrosLote = TypeAdapter(List[Livro])
+MAX_ERROS_LOTE = 100
+
+def valida_id(id):
     if id <= 0:
         return False
-        
-    for livro in tree.findall('livro'):
-        if int(livro.attrib['id']) == id:
-            return True
-    return False
-
-def xml_element_to_json(element):
-    return {
-        'id': int(element.attrib['id']),
-        'titulo': element.find('titulo').text,
-        'autor': element.find('autor').text,
-        'ano': int(element.find('ano').text),
-        'genero': element.find('genero').text
-    }
+    
+    return repositorio.existe(id)
 
 @app.get('/')
 def raiz():
     return {'Deu': 'Certo'}
 
+def livros_em_json(livros):
+    # Gera o mesmo objeto de antes ({"id": {...}, ...}) aos pedaços, um livro por vez
+    testaElem = lambda valor : '' if valor is None else str(valor)
+    
+    separador = ''
+    yield '{'
+    for livro in livros:
+        conteudo = {
+            'titulo': testaElem(livro['titulo']),
+            'autor': testaElem(livro['autor']),
+            'ano': testaElem(livro['ano']),
+            'genero': testaElem(livro['genero'])
+        }
+        yield separador + json.dumps(str(livro['id'])) + ':' + json.dumps(conteudo, ensure_ascii=False)
+        separador = ','
+    yield '}'
+
+# O cursor é o par (valor do campo da ordem, id) do último livro da página, em JSON e base64 url-safe.
+# Por ser uma chave e não uma posição, continua valendo se aquele livro for removido ou sair do filtro
+def codifica_cursor(livro, campo):
+    return base64.urlsafe_b64encode(json.dumps([livro[campo], livro['id']]).encode()).decode().rstrip('=')
+
+def decodifica_cursor(cursor, campo):
+    try:
+        valor, id = json.loads(base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4)))
+    except (binascii.Error, ValueError, TypeError):
+        raise HTTPException(status_code=HTTPStatus.BAD_REQUEST, detail='Cursor inválido')
+    tipo = int if campo in ('id', 'ano') else str
+    if type(id) is not int or not (type(valor) is tipo or (valor is None and campo != 'id')):
+        raise HTTPException(status_code=HTTPStatus.BAD_REQUEST, detail='Cursor inválido para esta ordem')
+    return valor, id
+
 @app.get('/livros')
-def retorna_livros():
-    livros = ET.parse('livros.xml')
-    saida = '{'
+def retorna_livros(
+    limit: Optional[int] = Query(default=None, ge=1),
+    cursor: Optional[str] = Query(default=None, description='Valor de X-Proximo-Cursor da página anterior'),
+    autor: Optional[str] = None,
+    genero: Optional[str] = None,
+    ano_min: Optional[int] = None,
+    ano_max: Optional[int] = None,
+    ordem: Optional[str] = Query(default=None, description="Campo para ordenar (id, titulo, autor, ano, genero); '-' na frente para decrescente")
+):
+    # X-Proximo-Cursor só vem quando ainda há livros depois desta página
+    try:
+        campo, _ = valida_ordem(ordem)
+    except ValueError as e:
+        raise HTTPException(status_code=HTTPStatus.BAD_REQUEST, detail=str(e))
+    apos = None if cursor is None else decodifica_cursor(cursor, campo)
+
+    if autor is None and genero is None and ano_min is None and ano_max is None and ordem is None:
+        if limit is None:
+            return StreamingResponse(livros_em_json(repositorio.itera(None if apos is None else apos[1])), media_type='application/json')
+        # Um livro a mais só para saber se existe próxima página
+        livros = list(repositorio.itera(None if apos is None else apos[1], limit + 1))
+    else:
+        # Filtros saem dos índices em memória, sem varrer o XML; cada página começa no cursor em vez de refiltrar
+        # e percorrer o resultado inteiro
+        livros = repositorio.filtra(autor=autor, genero=genero, ano_min=ano_min, ano_max=ano_max, ordem=ordem,
+                                    apos=apos, limite=None if limit is None else limit + 1)
+        if limit is None:
+            return StreamingResponse(livros_em_json(livros), media_type='application/json')
+
+    headers = None
+    if len(livros) > limit:
+        livros = livros[:limit]
+        headers = {'X-Proximo-Cursor': codifica_cursor(livros[-1], campo)}
+    return StreamingResponse(livros_em_json(livros), media_type='application/json', headers=headers)
+
+def le_lote(corpo: bytes):
+    # Aceita um array JSON ou NDJSON (um livro por linha) e valida tudo antes de gravar qualquer coisa
+    if corpo.lstrip()[:1] == b'[':
+        try:
+            return LivrosLote.validate_json(corpo), []
+        except ValidationError as e:
+            # include_input=False: o input de um corpo que nem é JSON são bytes, que o detail não serializa
+            return [], e.errors(include_url=False, include_input=False)[:MAX_ERROS_LOTE]
     
-    testaElem = lambda el : el.text if el is not None else ''
+    livros, erros = [], []
+    for numero, linha in enumerate(corpo.splitlines(), start=1):
+        if not linha.strip():
+            continue
+        try:
+            livros.append(Livro.model_validate_json(linha))
+        except ValidationError as e:
+            erros.extend({'linha': numero, **erro} for erro in e.errors(include_url=False, include_input=False))
+            if len(erros) >= MAX_ERROS_LOTE:
+                break
+    return livros, erros[:MAX_ERROS_LOTE]
+
+def grava_lote(corpo: bytes):
+    livros, erros = le_lote(corpo)
+    if erros:
+        raise HTTPException(status_code=HTTPStatus.UNPROCESSABLE_ENTITY, detail=erros)
+    
+    invalidos = [livro.id for livro in livros if livro.id <= 0]
+    if invalidos:
+        raise HTTPException(status_code=HTTPStatus.BAD_REQUEST, detail={'ids_invalidos': invalidos[:MAX_ERROS_LOTE]})
+    
+    try:
+        repositorio.adiciona_lote([livro.model_dump() for livro in livros])
+    except ValueError as e:
+        raise HTTPException(status_code=HTTPStatus.CONFLICT, detail={'ids_em_uso': e.args[0][:MAX_ERROS_LOTE]})
     
-    for livro in livros.findall('livro'):
-        saida += f'"{livro.get("id")}"' + ':'
-        saida += '{'
-        saida += '"titulo":' + f'"{testaElem(livro.find("titulo"))}"' + ','
-        saida += '"autor":' +  f'"{testaElem(livro.find("autor"))}"' +  ','
-        saida += '"ano":' +  f'"{testaElem(livro.find("ano"))}"' +  ','
-        saida += '"genero":' +  f'"{testaElem(livro.find("genero"))}"'
-        saida += '},'
-    saida = saida[:len(saida)-1]
-    saida += '}'
-    return json.loads(saida)
+    return {'inseridos': len(livros)}
+
+@app.post('/livros/lote', status_code=HTTPStatus.CREATED)
+async def cria_livros_lote(req: Request):
+    # Validar até milhões de livros, serializar a linha do journal e o fsync levam segundos:
+    # rodam no threadpool para não parar o event loop (e as outras requisições) nesse tempo
+    return await run_in_threadpool(grava_lote, await req.body())
+
+@app.get('/livros/exportar')
+def exporta_livros():
+    linhas = (json.dumps(livro, ensure_ascii=False) + '\n' for livro in repositorio.itera())
+    return StreamingResponse(linhas, media_type='application/x-ndjson')
 
 @app.post('/livros', status_code=HTTPStatus.CREATED, response_model=Livro)
 def cria_livro(livro: Livro):
     try:
-        tree = ET.parse('livros.xml')
-        root = tree.getroot()
-
-        if not valida_id(livro.id, tree):
+        if livro.id <= 0:
             raise HTTPException(status_code=HTTPStatus.BAD_REQUEST, detail='ID inválido')
         
-        for livro_atual in root.findall('livro'):
-            if livro_atual is not None:
-                if livro.id == int(livro_atual.get('id')):
-                    raise HTTPException(HTTPStatus.CONFLICT, detail="ID já está sendo utilizado")
-            raizLivros = ET.Element('livros')
-            for livro_atual in root.findall('livro'): raizLivros.append(livro_atual)
-            livro_novo = ET.SubElement(raizLivros, 'livro')
-            livro_novo.set('id', str(livro.id))
-            ET.SubElement(livro_novo, 'titulo').text = livro.titulo
-            ET.SubElement(livro_novo, 'autor').text = livro.autor
-            ET.SubElement(livro_novo, 'ano').text = str(livro.ano)
-            ET.SubElement(livro_novo, 'genero').text = livro.genero
-            
-            novaTree = ET.ElementTree(raizLivros)
-            ET.indent(novaTree, level=1)
-            novaTree.write('livros.xml', encoding='unicode')
+        repositorio.adiciona(livro.model_dump())
+    except ValueError:
+        raise HTTPException(HTTPStatus.CONFLICT, detail="ID já está sendo utilizado")
     except HTTPException as e:
         raise HTTPException(HTTPStatus.BAD_REQUEST, detail=e.detail)
     else:
@@ -87,43 +167,34 @@ def cria_livro(livro: Livro):
 @app.put('/livros/{id_livro}',status_code=HTTPStatus.OK, response_model=Livro)
 def atualiza_livro(id_livro: int, livro: Livro):
     try:
-        tree = ET.parse('livros.xml')
-        root = tree.getroot()
-
-        if not valida_id(id_livro, tree):
+        if not valida_id(id_livro):
             raise HTTPException(status_code=HTTPStatus.NOT_FOUND, detail='ID inválido')
-            
-        for livro_atual in root.findall('livro'): 
-            if livro_atual is not None:
-                if id_livro == int(livro_atual.get('id')):
-                    livro_atual.set('id', str(livro.id))
-                    livro_atual.find('titulo').text = livro.titulo
-                    livro_atual.find('autor').text = livro.autor
-                    livro_atual.find('ano').text = str(livro.ano)
-                    livro_atual.find('genero').text = livro.genero            
+        
+        repositorio.atualiza(id_livro, livro.model_dump())
+    except KeyError:
+        raise HTTPException(status_code=HTTPStatus.NOT_FOUND, detail='ID inválido')
+    except ValueError:
+        raise HTTPException(HTTPStatus.CONFLICT, detail="ID já está sendo utilizado")
     except HTTPException as e:
         raise HTTPException(status_code=HTTPStatus.BAD_REQUEST, detail=str(e.detail))
     else:
-        tree.write('livros.xml', encoding='unicode')
         return livro.model_dump()
 
 @app.delete('/livros/{id_livro}', status_code=HTTPStatus.OK, response_model=Livro)
 def remove_livro(id_livro: int):
     try:
-        tree = ET.parse('livros.xml')
-        root = tree.getroot()
-
-        if not valida_id(id_livro, tree):
+        if not valida_id(id_livro):
             raise HTTPException(status_code=HTTPStatus.NOT_FOUND, detail='ID inválido')
-
-        elementoRemovido = ET.Element('livro')
         
-        for livro_atual in root.findall('livro'):
-            if livro_atual is not None and id_livro == int(livro_atual.get('id')):
-                elementoRemovido = livro_atual
-                root.remove(livro_atual)                
+        livroRemovido = repositorio.remove(id_livro)
+    except KeyError:
+        raise HTTPException(status_code=HTTPStatus.NOT_FOUND, detail='ID inválido')
     except HTTPException as e:
         raise HTTPException(status_code=HTTPStatus.BAD_REQUEST, detail=e.detail)
     else:
-        tree.write('livros.xml', encoding='unicode')
-        return xml_element_to_json(elementoRemovido)
\ No newline at end of file
+        return livroRemovido
+
+@app.on_event('shutdown')
+def finaliza():
+    # Aplica no livros.xml o que ainda estiver só no journal
+    repositorio.fecha()
\ No newline at end of file
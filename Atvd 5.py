@@ -1,32 +1,41 @@
 import logging as log
 import yaml
-import json
+from log_fila import configura_logging
+from validador_json import compila_formato, em_lotes, formata_relatorio, le_registros, novo_relatorio, registra_lote, valida_lote, valida_paralelo
 
-try:
-  with open('config.yaml', 'r') as file:
-    config = yaml.safe_load(file)
+# Com o start method spawn os processos do valida_paralelo reimportam este arquivo: sem a guarda cada um
+# reabriria o app.log (filemode 'w') e criaria o próprio pool
+if __name__ == '__main__':
+  try:
+    with open('config.yaml', 'r') as file:
+      config = yaml.safe_load(file)
 
-    log.basicConfig(filename=config['logging']['file'], format=config['logging']['format'], level=config['logging']['level'], filemode='w')
-except Exception as e:
-  print('Erro ao ler o arquivo de configuração: ', e)
-else:
-  log.info('Arquivo de configuração lido com sucesso.')
+      configura_logging(config['logging'])
+  except Exception as e:
+    print('Erro ao ler o arquivo de configuração: ', e)
+  else:
+    log.info('Arquivo de configuração lido com sucesso.')
 
-try:
-  with open(config['data']['file'], 'r') as dataJson:
-    data = json.load(dataJson)
-    capitais = data['capitais']
+  try:
+    # O formatter_json é compilado uma vez em uma tabela {chave: tipo}
+    tipos = compila_formato(config['formatter_json'])
+    processos = config['data'].get('processos', 1)
+
+    if processos != 1:
+      # Shards validados em paralelo; o log continua sendo escrito só por este processo, na ordem dos registros
+      relatorio = valida_paralelo(config['data']['file'], tipos, processos=processos)
+    else:
+      relatorio = novo_relatorio()
+    
+      # Os registros chegam um a um (array 'capitais' ou JSON Lines), então a memória não cresce com o arquivo
+      capitais = le_registros(config['data']['file'])
     
-    for cidade in capitais:
-      warming = False
-      for chave, valor in cidade.items():
-        yaml_json_format_type = config['formatter_json'][f'{chave}']
-        yaml_json_format_type  = 'str' if yaml_json_format_type == 'string' else yaml_json_format_type
-        if yaml_json_format_type != type(valor).__name__:
-          log.warning('Erro no registro: ' + str(cidade) + ' - Dado inválido: ' +  str(chave))
-          warming = True
-      
-      if warming == False: log.info('Processando registro: ' + str(cidade))
-except Exception as e:
-  print('Erro ao ler o arquivo JSON.', e)
-  log.error('Erro ao ler o arquivo JSON.')
\ No newline at end of file
+      for lote in em_lotes(capitais):
+        _, invalidos = valida_lote(lote, tipos, relatorio)
+        # Registro a registro na ordem do arquivo: os warnings de um inválido ou o info de um válido
+        registra_lote(log.getLogger(), lote, invalidos)
+  
+    print(formata_relatorio(relatorio))
+  except Exception as e:
+    print('Erro ao ler o arquivo JSON.', e)
+    log.error('Erro ao ler o arquivo JSON.')
@@ -0,0 +1,106 @@
+import json
+import os
+import random
+import statistics
+import subprocess
+import sys
+import time
+import urllib.error
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+
+# Teste de carga dos endpoints contra o banco local do config.yaml.
+# Uso: python bench_carga.py [concorrencia] [duracao_s] [url]; sem url sobe o uvicorn numa porta local.
+
+PORTA = 8765
+
+def get_json(url, timeout=30):
+    with urllib.request.urlopen(url, timeout=timeout) as resposta:
+        return json.load(resposta)
+
+def sobe_servidor(porta=PORTA, env=None):
+    pasta = os.path.abspath(os.path.dirname(__file__))
+    processo = subprocess.Popen([sys.executable, '-m', 'uvicorn', 'endpoints:app', '--port', str(porta), '--log-level', 'warning'],
+                                cwd=pasta, env={**os.environ, **(env or {})})
+    url = f'http://127.0.0.1:{porta}'
+    for _ in range(100):
+        try:
+            get_json(f'{url}/metricas/pool', timeout=1)
+            return processo, url
+        except (urllib.error.URLError, ConnectionError):
+            time.sleep(0.1)
+    processo.terminate()
+    raise RuntimeError('O servidor não subiu a tempo')
+
+def rotas_de_carga(url):
+    # Mistura de leituras por id, listagem e contagem, com ids sorteados dentro do que existe no banco
+    quantidades = get_json(f'{url}/quantidade_entidades')
+    rotas = [lambda: f'{url}/quantidade_entidades']
+    for entidade, chave in (('produtos', 'Produtos'), ('clientes', 'Clientes'), ('vendas', 'Vendas'), ('estoque', 'Estoque')):
+        if quantidades.get(chave):
+            rotas.append(lambda entidade=entidade, total=quantidades[chave]: f'{url}/{entidade}/{random.randint(1, total)}')
+    return rotas
+
+def requisicao(endereco):
+    inicio = time.perf_counter()
+    try:
+        with urllib.request.urlopen(endereco, timeout=30) as resposta:
+            resposta.read()
+            ok = resposta.status < 500
+    except urllib.error.HTTPError as e:
+        ok = e.code < 500
+    except (urllib.error.URLError, ConnectionError, TimeoutError):
+        ok = False
+    return time.perf_counter() - inicio, ok
+
+def executa_carga(rotas, concorrencia, duracao):
+    # Cada thread manda uma requisição atrás da outra até acabar o tempo
+    fim = time.perf_counter() + duracao
+
+    def cliente():
+        latencias, erros = [], 0
+        while time.perf_counter() < fim:
+            latencia, ok = requisicao(random.choice(rotas)())
+            latencias.append(latencia)
+            erros += not ok
+        return latencias, erros
+
+    inicio = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concorrencia) as pool:
+        resultados = list(pool.map(lambda _: cliente(), range(concorrencia)))
+    decorrido = time.perf_counter() - inicio
+
+    latencias = sorted(latencia for parcial, _ in resultados for latencia in parcial)
+    if not latencias:
+        return {'requisicoes': 0, 'erros': 0, 'req_s': 0.0, 'p50_ms': 0.0, 'p95_ms': 0.0, 'p99_ms': 0.0}
+    percentil = lambda p: latencias[min(len(latencias) - 1, int(p * len(latencias)))] * 1000
+    return {
+        'requisicoes': len(latencias),
+        'erros': sum(erros for _, erros in resultados),
+        'req_s': len(latencias) / decorrido,
+        'p50_ms': statistics.median(latencias) * 1000,
+        'p95_ms': percentil(0.95),
+        'p99_ms': percentil(0.99),
+    }
+
+def imprime_resultado(titulo, resultado):
+    print(f'{titulo}: {resultado["requisicoes"]} requisições, {resultado["erros"]} erros, {resultado["req_s"]:.1f} req/s, '
+          f'p50 {resultado["p50_ms"]:.1f} ms, p95 {resultado["p95_ms"]:.1f} ms, p99 {resultado["p99_ms"]:.1f} ms')
+
+if __name__ == '__main__':
+    concorrencia = int(sys.argv[1]) if len(sys.argv) > 1 else 50
+    duracao = float(sys.argv[2]) if len(sys.argv) > 2 else 30
+    processo = None
+    if len(sys.argv) > 3:
+        url = sys.argv[3].rstrip('/')
+    else:
+        processo, url = sobe_servidor()
+
+    try:
+        rotas = rotas_de_carga(url)
+        imprime_resultado(f'{concorrencia} clientes por {duracao:.0f}s', executa_carga(rotas, concorrencia, duracao))
+        print('Pool:', json.dumps(get_json(f'{url}/metricas/pool'), ensure_ascii=False))
+    finally:
+        if processo is not None:
+            processo.terminate()
+            processo.wait()
@@ -0,0 +1,69 @@
+import os
+import sys
+import tempfile
+import time
+from sqlalchemy import create_engine, func, text
+from sqlalchemy.orm import sessionmaker
+import db_models
+from db_models import Produtos, Clientes, Vendas, Fornecedores, Estoque
+from contagens import ContadorEntidades
+
+# /quantidade_entidades com 10M vendas num SQLite local: as cinco COUNT(*) em sequência de antes,
+# a reconciliação num round-trip só e a leitura dos contadores em memória.
+# Uso: python bench_contagens.py [vendas] [repeticoes]
+
+MODELOS = {'Produtos': Produtos, 'Clientes': Clientes, 'Vendas': Vendas, 'Fornecedores': Fornecedores, 'Estoque': Estoque}
+
+def popula(engine, vendas, outros=1000):
+    # Gera as linhas dentro do próprio SQLite com uma CTE recursiva, sem passar pelo Python
+    serie = 'WITH RECURSIVE seq(x) AS (SELECT 1 UNION ALL SELECT x + 1 FROM seq WHERE x < :total) '
+    with engine.begin() as conexao:
+        conexao.execute(text(f'INSERT INTO produtos ("ID_Produto", nome, valor_unitario) {serie}SELECT x, \'P\' || x, 9.9 FROM seq'), {'total': outros})
+        conexao.execute(text(f'INSERT INTO clientes ("ID_Cliente", forma_pagamento, programa_fidelidade) {serie}SELECT x, \'Pix\', NULL FROM seq'), {'total': outros})
+        conexao.execute(text(f'INSERT INTO fornecedores ("ID_Fornecedor", nome, "ID_Produto", quantidade, valor_unitario) {serie}SELECT x, \'F\' || x, x, 10, 5.0 FROM seq'), {'total': outros})
+        conexao.execute(text(f'INSERT INTO estoque ("ID_Estoque", "ID_Fornecedor", "ID_Produto", quantidade, categoria, validade_dias) {serie}SELECT x, x, x, 10, NULL, 30 FROM seq'), {'total': outros})
+        conexao.execute(text(f'INSERT INTO vendas ("ID_Venda", "ID_Cliente", "ID_Produto", quantidade, valor_total) {serie}SELECT x, 1 + x % :outros, 1 + x % :outros, 1 + x % 20, 10.0 FROM seq'), {'total': vendas, 'outros': outros})
+
+# Como o endpoint fazia antes: uma consulta por tabela
+def conta_separado(db):
+    return {nome: db.query(func.count()).select_from(modelo).scalar() for nome, modelo in MODELOS.items()}
+
+def mede(funcao, repeticoes):
+    inicio = time.perf_counter()
+    for _ in range(repeticoes):
+        resultado = funcao()
+    return (time.perf_counter() - inicio) / repeticoes * 1000, resultado
+
+if __name__ == '__main__':
+    vendas = int(sys.argv[1]) if len(sys.argv) > 1 else 10_000_000
+    repeticoes = int(sys.argv[2]) if len(sys.argv) > 2 else 5
+
+    with tempfile.TemporaryDirectory() as pasta:
+        engine = create_engine(f'sqlite:///{os.path.join(pasta, "contagens.db")}')
+        db_models.Base.metadata.create_all(bind=engine)
+        inicio = time.perf_counter()
+        popula(engine, vendas)
+        print(f'{vendas} vendas geradas em {time.perf_counter() - inicio:.1f}s')
+
+        contador = ContadorEntidades(MODELOS, ttl=3600)
+        with sessionmaker(bind=engine)() as db:
+            t_separado, separado = mede(lambda: conta_separado(db), repeticoes)
+            t_reconcilia, reconciliado = mede(lambda: contador.obtem(db, forcar=True), repeticoes)
+            t_cache, em_cache = mede(lambda: contador.obtem(db), repeticoes * 1000)
+        assert separado == reconciliado == em_cache
+
+        # Os contadores acompanham inserts e deletes do ORM sem consultar o banco
+        with sessionmaker(bind=engine)() as db:
+            db.add_all(Vendas(ID_Venda=vendas + i, ID_Cliente=1, ID_Produto=1, quantidade=1, valor_total=1) for i in range(1, 101))
+            db.commit()
+            db.delete(db.get(Vendas, 1))
+            db.commit()
+            db.add(Vendas(ID_Venda=vendas + 1000, ID_Cliente=1, ID_Produto=1, quantidade=1, valor_total=1))
+            db.flush()
+            db.rollback()
+            assert contador.obtem(db)['Vendas'] == vendas + 99 == conta_separado(db)['Vendas']
+        engine.dispose()
+
+    print(f'Cinco COUNT(*) em sequência: {t_separado:.1f} ms')
+    print(f'Reconciliação em um round-trip: {t_reconcilia:.1f} ms')
+    print(f'Contadores em memória (dentro do ttl): {t_cache * 1000:.2f} µs')
@@ -0,0 +1,30 @@
+import json
+import sys
+from bench_carga import PORTA, get_json, sobe_servidor, rotas_de_carga, executa_carga, imprime_resultado
+
+# Requisições por segundo do modo sync (threads do FastAPI) contra o modo async (AsyncSession + asyncpg),
+# com a mesma carga e o mesmo banco local do config.yaml.
+# Uso: python bench_modos.py [concorrencia...] [--duracao=s]
+
+if __name__ == '__main__':
+    duracao = 20.0
+    concorrencias = []
+    for argumento in sys.argv[1:]:
+        if argumento.startswith('--duracao='):
+            duracao = float(argumento.split('=', 1)[1])
+        else:
+            concorrencias.append(int(argumento))
+    concorrencias = concorrencias or [10, 50, 200]
+
+    for modo in ('sync', 'async'):
+        processo, url = sobe_servidor(PORTA, env={'TRABALHO2_MODO': modo})
+        try:
+            rotas = rotas_de_carga(url)
+            # Aquecimento: abre as conexões do pool antes de medir
+            executa_carga(rotas, max(concorrencias), 2)
+            for concorrencia in concorrencias:
+                imprime_resultado(f'{modo:>5} com {concorrencia:>3} clientes', executa_carga(rotas, concorrencia, duracao))
+            print(f'{modo:>5} pool:', json.dumps(get_json(f'{url}/metricas/pool'), ensure_ascii=False))
+        finally:
+            processo.terminate()
+            processo.wait()
@@ -0,0 +1,67 @@
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+from sqlalchemy import create_engine, func, select
+from sqlalchemy.orm import sessionmaker
+import db_models
+from db_connect import carrega_json_em_lote
+
+# Carga dos data_json num SQLite local no lugar do PostgreSQL, para comparar o seed antigo com o em lote
+
+def gera_vendas(arquivo, total, produtos=1000, clientes=1000, seed=0):
+    rng = random.Random(seed)
+    with open(arquivo, 'w', encoding='utf-8') as saida:
+        json.dump([{
+            'ID_Venda': id,
+            'ID_Cliente': rng.randint(1, clientes),
+            'ID_Produto': rng.randint(1, produtos),
+            'Quantidade': rng.randint(1, 20),
+            'Valor_Total': round(rng.uniform(1, 500), 2)
+        } for id in range(1, total + 1)], saida)
+
+# Como o create_vendas fazia antes: um db.get e um db.add por registro
+def seed_antigo(db, arquivo):
+    with open(arquivo, 'r', encoding='utf-8') as file:
+        for venda in json.load(file):
+            if db.get(db_models.Vendas, venda['ID_Venda']) is None:
+                db.add(db_models.Vendas(ID_Venda=venda['ID_Venda'], ID_Cliente=venda['ID_Cliente'], ID_Produto=venda['ID_Produto'], quantidade=venda['Quantidade'], valor_total=venda['Valor_Total']))
+
+def mede(nome, funcao, pasta, arquivo):
+    engine = create_engine(f'sqlite:///{os.path.join(pasta, nome)}.db')
+    db_models.Base.metadata.create_all(bind=engine)
+    with sessionmaker(bind=engine)() as db:
+        inicio = time.perf_counter()
+        funcao(db, arquivo)
+        db.commit()
+        duracao = time.perf_counter() - inicio
+        total = db.scalar(select(func.count()).select_from(db_models.Vendas))
+    engine.dispose()
+    return duracao, total
+
+if __name__ == '__main__':
+    total = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    # O seed antigo é lento demais para 1M linhas; por padrão ele roda numa amostra menor
+    total_antigo = int(sys.argv[2]) if len(sys.argv) > 2 else min(total, 50_000)
+
+    with tempfile.TemporaryDirectory() as pasta:
+        arquivo = os.path.join(pasta, 'data_vendas.json')
+        arquivo_antigo = os.path.join(pasta, 'data_vendas_antigo.json')
+        gera_vendas(arquivo, total)
+        gera_vendas(arquivo_antigo, total_antigo)
+
+        t_antigo, n_antigo = mede('antigo', seed_antigo, pasta, arquivo_antigo)
+        t_lote, n_lote = mede('lote', lambda db, arq: carrega_json_em_lote(db, db_models.Vendas, arq), pasta, arquivo)
+        # Segunda carga no mesmo banco: todas as PKs já existem e nada é inserido
+        engine = create_engine(f'sqlite:///{os.path.join(pasta, "lote")}.db')
+        with sessionmaker(bind=engine)() as db:
+            inicio = time.perf_counter()
+            inseridos = carrega_json_em_lote(db, db_models.Vendas, arquivo)
+            t_repetido = time.perf_counter() - inicio
+        engine.dispose()
+
+    print(f'Seed antigo: {n_antigo} vendas em {t_antigo:.2f}s ({n_antigo / t_antigo:,.0f} linhas/s)')
+    print(f'Seed em lote: {n_lote} vendas em {t_lote:.2f}s ({n_lote / t_lote:,.0f} linhas/s)')
+    print(f'Recarga com tudo já existente: {t_repetido:.2f}s ({inseridos} inseridas)')
@@ -0,0 +1,138 @@
+from sqlalchemy import event, func, select
+from sqlalchemy.orm import Session, object_session
+import asyncio
+import threading
+import time
+import logging as log
+
+TTL_PADRAO = 300
+
+class ContadorEntidades:
+    # Quantidade de linhas por entidade mantida em memória:
+    # - after_insert/after_delete (eventos do mapper, durante o flush) acumulam deltas em session.info
+    # - after_commit aplica os deltas nos contadores; rollback descarta
+    # - passado o ttl a próxima leitura reconcilia com um único SELECT de subconsultas COUNT(*)
+    # - commits que chegam enquanto a reconciliação roda são reaplicados sobre o resultado dela
+    # Insert/delete em massa pelo Core (como o seed em lote) e escritas de outros processos não disparam os
+    # eventos do mapper; essas diferenças somem na próxima reconciliação.
+    def __init__(self, modelos, ttl=TTL_PADRAO):
+        self.modelos = modelos  # {nome na resposta: modelo}
+        self.ttl = ttl
+        self._nomes = {modelo: nome for nome, modelo in modelos.items()}
+        self._trava = threading.Lock()
+        self._trava_reconciliacao = threading.Lock()
+        # No modo async a reconciliação espera I/O no event loop: um threading.Lock preso ali travaria o loop
+        self._trava_reconciliacao_async = asyncio.Lock()
+        self._valores = None
+        self._deltas_durante = None
+        self._reconciliado_em = 0.0
+        self.reconciliacoes = 0
+        self._registra_eventos()
+
+    def _registra_eventos(self):
+        for modelo in self.modelos.values():
+            event.listen(modelo, 'after_insert', self._depois_insert)
+            event.listen(modelo, 'after_delete', self._depois_delete)
+        event.listen(Session, 'after_commit', self._depois_commit)
+        event.listen(Session, 'after_rollback', self._depois_rollback)
+
+    def _acumula(self, alvo, delta):
+        sessao = object_session(alvo)
+        if sessao is None:
+            return
+        deltas = sessao.info.setdefault('deltas_contagem', {})
+        nome = self._nomes[type(alvo)]
+        deltas[nome] = deltas.get(nome, 0) + delta
+
+    def _depois_insert(self, mapper, conexao, alvo):
+        self._acumula(alvo, 1)
+
+    def _depois_delete(self, mapper, conexao, alvo):
+        self._acumula(alvo, -1)
+
+    def _depois_commit(self, sessao):
+        deltas = sessao.info.pop('deltas_contagem', None)
+        if not deltas:
+            return
+        with self._trava:
+            if self._deltas_durante is not None:
+                for nome, delta in deltas.items():
+                    self._deltas_durante[nome] = self._deltas_durante.get(nome, 0) + delta
+            if self._valores is None:
+                return
+            for nome, delta in deltas.items():
+                self._valores[nome] += delta
+
+    def _depois_rollback(self, sessao):
+        sessao.info.pop('deltas_contagem', None)
+
+    def consulta_contagens(self):
+        # Um round-trip: SELECT (SELECT count(*) FROM produtos) AS "Produtos", (SELECT count(*) FROM clientes) ...
+        return select(*(select(func.count()).select_from(modelo).scalar_subquery().label(nome) for nome, modelo in self.modelos.items()))
+
+    def _inicia_reconciliacao(self):
+        with self._trava:
+            self._deltas_durante = {}
+
+    def _conclui_reconciliacao(self, valores):
+        # Deltas de commits que terminaram durante o COUNT podem não estar no resultado dele e são somados de novo.
+        # Um commit que entrou no COUNT mas só disparou o after_commit depois conta duas vezes até a próxima
+        # reconciliação; essa janela é a do próprio hook, bem menor que a do COUNT.
+        with self._trava:
+            if valores is not None:
+                for nome, delta in self._deltas_durante.items():
+                    valores[nome] += delta
+                self._valores = valores
+                self._reconciliado_em = time.monotonic()
+                self.reconciliacoes += 1
+            self._deltas_durante = None
+        if valores is not None:
+            log.debug('Contagens reconciliadas: %s', valores)
+
+    def reconcilia(self, db):
+        self._inicia_reconciliacao()
+        valores = None
+        try:
+            valores = dict(db.execute(self.consulta_contagens()).one()._mapping)
+        finally:
+            self._conclui_reconciliacao(valores)
+        return self.valores()
+
+    async def reconcilia_async(self, db):
+        self._inicia_reconciliacao()
+        valores = None
+        try:
+            valores = dict((await db.execute(self.consulta_contagens())).one()._mapping)
+        finally:
+            self._conclui_reconciliacao(valores)
+        return self.valores()
+
+    def valores(self):
+        with self._trava:
+            return dict(self._valores)
+
+    def expirado(self):
+        return self._valores is None or time.monotonic() - self._reconciliado_em >= self.ttl
+
+    def obtem(self, db, forcar=False):
+        # Só uma requisição reconcilia por vez; as que esperaram reaproveitam o resultado
+        if forcar or self.expirado():
+            with self._trava_reconciliacao:
+                if forcar or self.expirado():
+                    return self.reconcilia(db)
+        return self.valores()
+
+    async def obtem_async(self, db, forcar=False):
+        # Mesmo fluxo do obtem com AsyncSession e asyncio.Lock; o threading.Lock _trava só protege trocas
+        # de valores em memória e nunca fica preso durante um await
+        if forcar or self.expirado():
+            async with self._trava_reconciliacao_async:
+                if forcar or self.expirado():
+                    return await self.reconcilia_async(db)
+        return self.valores()
+
+    def nome(self, modelo):
+        return self._nomes[modelo]
+
+    def idade(self):
+        return None if self._valores is None else time.monotonic() - self._reconciliado_em
@@ -6,35 +6,24 @@ from db_models import Clientes
 from http import HTTPStatus
 from sqlalchemy.exc import SQLAlchemyError
 from typing import Optional
-from pagination import PaginationParams
+from pagination import PaginationParams, consulta_pagina, parametros_paginacao, monta_pagina, total_linhas
 
 class ClientePy(BaseModel):
     forma_pagamento: str
     programa_fidelidade: Optional[str] = None
     
-def route_clientes(pref: str):
+def route_clientes(pref: str, contador):
     router = APIRouter(prefix=f'/{pref}', tags=[pref])
 
+    # Paginação por keyset na PK; /todos mantém a listagem completa que antes ocupava a mesma rota '/'
     @router.get('/')
+    def get_all_clientes_pagination(pag: PaginationParams = Depends(parametros_paginacao), db: Session = Depends(get_db)):
+        clientes = db.scalars(consulta_pagina(Clientes, pag)).all()
+        return monta_pagina(clientes, Clientes, pag, total_linhas(db, contador, Clientes, pag.total), 'clientes')
+
+    @router.get('/todos')
     def get_all_clientes(db: Session = Depends(get_db)):
         return db.query(Clientes).order_by(Clientes.ID_Cliente).all()
-    
-    @router.get('/')
-    def get_all_clientes_pagination(pag: PaginationParams = Depends(), db: Session = Depends(get_db)):
-        offset = (pag.page - 1) * pag.limit
-        clientes = db.query(Clientes).offset(offset).limit(pag.limit).all()
-        total_clientes = db.query(Clientes).count()
-        total_pages = (total_clientes + pag.limit - 1) // pag.limit
-        
-        return {
-            'data': clientes,
-            'pagination': {
-                'page': pag.page,
-                'limit': pag.limit,
-                'total_clientes': total_clientes,
-                'total_pages': total_pages
-            }
-        }
 
     @router.get('/{id_cliente}')
     def get_cliente(id_cliente: int, db: Session = Depends(get_db)):
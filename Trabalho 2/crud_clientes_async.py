@@ -0,0 +1,96 @@
+from fastapi import Depends, HTTPException, APIRouter
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from db_connect_async import get_db_async
+from db_models import Clientes
+from http import HTTPStatus
+from sqlalchemy.exc import SQLAlchemyError
+from pagination import PaginationParams, consulta_pagina, parametros_paginacao, monta_pagina, total_linhas_async
+from crud_clientes import ClientePy
+
+def route_clientes_async(pref: str, contador):
+    router = APIRouter(prefix=f'/{pref}', tags=[pref])
+
+    @router.get('/')
+    async def get_all_clientes_pagination(pag: PaginationParams = Depends(parametros_paginacao), db: AsyncSession = Depends(get_db_async)):
+        clientes = (await db.scalars(consulta_pagina(Clientes, pag))).all()
+        total = await total_linhas_async(db, contador, Clientes, pag.total)
+        return monta_pagina(clientes, Clientes, pag, total, 'clientes')
+
+    @router.get('/todos')
+    async def get_all_clientes(db: AsyncSession = Depends(get_db_async)):
+        return (await db.scalars(select(Clientes).order_by(Clientes.ID_Cliente))).all()
+
+    @router.get('/{id_cliente}')
+    async def get_cliente(id_cliente: int, db: AsyncSession = Depends(get_db_async)):
+        if not id_cliente:
+            raise HTTPException(status_code=HTTPStatus.BAD_REQUEST, detail='ID inválido')
+
+        try:
+            query = await db.get(Clientes, id_cliente)
+            if query is None:
+                raise HTTPException(status_code=HTTPStatus.BAD_REQUEST, detail='ID não encontrado')
+        except HTTPException as e:
+            raise HTTPException(status_code=HTTPStatus.BAD_REQUEST, detail=f'Erro ao retornar o cliente. Erro: {str(e)}')
+        return query
+
+    @router.post('/')
+    async def create_cliente(cliente_req: ClientePy, db: AsyncSession = Depends(get_db_async)):
+        try:
+            cliente = Clientes(
+                forma_pagamento=cliente_req.forma_pagamento,
+                programa_fidelidade=cliente_req.programa_fidelidade
+            )
+            db.add(cliente)
+            await db.commit()
+            await db.refresh(cliente)
+        except SQLAlchemyError as e:
+            await db.rollback()
+            raise HTTPException(status_code=HTTPStatus.INTERNAL_SERVER_ERROR, detail=f"Erro ao criar cliente no banco de dados: {str(e)}")
+        else:
+            return cliente
+
+    @router.put('/{id_cliente}')
+    async def update_cliente(id_cliente: int, cliente_req: ClientePy, db: AsyncSession = Depends(get_db_async)):
+        if not id_cliente:
+            raise HTTPException(status_code=HTTPStatus.BAD_REQUEST, detail='ID inválido')
+
+        try:
+            cliente_db = await db.get(Clientes, id_cliente)
+            if cliente_db is None:
+                raise HTTPException(status_code=HTTPStatus.BAD_REQUEST, detail='ID não encontrado')
+
+            cliente_antigo = {
+                "ID_Cliente": cliente_db.ID_Cliente,
+                "forma_pagamento": cliente_db.forma_pagamento,
+                "programa_fidelidade": cliente_db.programa_fidelidade
+            }
+
+            cliente_db.forma_pagamento = cliente_req.forma_pagamento
+            cliente_db.programa_fidelidade = cliente_req.programa_fidelidade
+
+            await db.commit()
+        except SQLAlchemyError as e:
+            await db.rollback()
+            raise HTTPException(status_code=HTTPStatus.INTERNAL_SERVER_ERROR, detail=f"Erro ao atualizar o cliente no banco de dados: {str(e)}")
+        else:
+            return cliente_antigo
+
+    @router.delete('/{id_cliente}')
+    async def delete_cliente(id_cliente: int, db: AsyncSession = Depends(get_db_async)):
+        if not id_cliente:
+            raise HTTPException(status_code=HTTPStatus.BAD_REQUEST, detail='ID inválido')
+
+        try:
+            del_cliente = await db.get(Clientes, id_cliente)
+            if del_cliente is None:
+                raise HTTPException(status_code=HTTPStatus.BAD_REQUEST, detail='ID não encontrado')
+            await db.delete(del_cliente)
+            await db.commit()
+        except SQLAlchemyError as e:
+            await db.rollback()
+            raise HTTPException(status_code=HTTPStatus.INTERNAL_SERVER_ERROR, detail=f"Erro ao excluir o cliente no banco de dados: {str(e)}")
+        else:
+            return del_cliente
+
+    return router
@@ -0,0 +1,112 @@
+from fastapi import Depends, HTTPException, APIRouter
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from db_connect_async import get_db_async
+from db_models import Estoque
+from http import HTTPStatus
+from sqlalchemy.exc import SQLAlchemyError
+from pagination import PaginationParams, consulta_pagina, parametros_paginacao, monta_pagina, total_linhas_async
+from crud_estoque import EstoquePy
+
+def route_estoque_async(pref: str, contador):
+    router = APIRouter(prefix=f'/{pref}', tags=[pref])
+
+    @router.get('/')
+    async def get_all_estoque_pagination(pag: PaginationParams = Depends(parametros_paginacao), db: AsyncSession = Depends(get_db_async)):
+        estoque = (await db.scalars(consulta_pagina(Estoque, pag))).all()
+        total = await total_linhas_async(db, contador, Estoque, pag.total)
+        return monta_pagina(estoque, Estoque, pag, total, 'estoque')
+
+    @router.get('/todos')
+    async def get_all_estoque(db: AsyncSession = Depends(get_db_async)):
+        return (await db.scalars(select(Estoque).order_by(Estoque.ID_Estoque))).all()
+
+    @router.get('/{id_estoque}')
+    async def get_estoque(id_estoque: int, db: AsyncSession = Depends(get_db_async)):
+        if not id_estoque:
+            raise HTTPException(status_code=HTTPStatus.BAD_REQUEST, detail='ID inválido')
+
+        try:
+            query = await db.get(Estoque, id_estoque)
+            if query is None:
+                raise HTTPException(status_code=HTTPStatus.BAD_REQUEST, detail='ID não encontrado')
+        except HTTPException as e:
+            raise HTTPException(status_code=HTTPStatus.BAD_REQUEST, detail=f'Erro ao retornar o estoque. Erro: {str(e)}')
+        return query
+
+    @router.post('/')
+    async def create_estoque(estoque_req: EstoquePy, db: AsyncSession = Depends(get_db_async)):
+        if not estoque_req.ID_Fornecedor or not estoque_req.ID_Produto:
+            raise HTTPException(status_code=HTTPStatus.BAD_REQUEST, detail="ID do fornecedor e do produto são obrigatórios.")
+        if estoque_req.quantidade <= 0:
+            raise HTTPException(status_code=HTTPStatus.BAD_REQUEST, detail="A quantidade deve ser maior que zero.")
+        if estoque_req.validade_dias <= 0:
+            raise HTTPException(status_code=HTTPStatus.BAD_REQUEST, detail="A validade em dias deve ser maior que zero.")
+
+        try:
+            estoque = Estoque(
+                ID_Fornecedor=estoque_req.ID_Fornecedor,
+                ID_Produto=estoque_req.ID_Produto,
+                quantidade=estoque_req.quantidade,
+                categoria=estoque_req.categoria,
+                validade_dias=estoque_req.validade_dias
+            )
+            db.add(estoque)
+            await db.commit()
+            await db.refresh(estoque)
+        except SQLAlchemyError as e:
+            await db.rollback()
+            raise HTTPException(status_code=HTTPStatus.INTERNAL_SERVER_ERROR, detail=f"Erro ao criar estoque no banco de dados: {str(e)}")
+        else:
+            return estoque
+
+    @router.put('/{id_estoque}')
+    async def update_estoque(id_estoque: int, estoque_req: EstoquePy, db: AsyncSession = Depends(get_db_async)):
+        if not id_estoque:
+            raise HTTPException(status_code=HTTPStatus.BAD_REQUEST, detail='ID inválido')
+
+        try:
+            estoque_db = await db.get(Estoque, id_estoque)
+            if estoque_db is None:
+                raise HTTPException(status_code=HTTPStatus.BAD_REQUEST, detail='ID não encontrado')
+
+            estoque_antigo = {
+                "ID_Estoque": estoque_db.ID_Estoque,
+                "ID_Fornecedor": estoque_db.ID_Fornecedor,
+                "ID_Produto": estoque_db.ID_Produto,
+                "quantidade": estoque_db.quantidade,
+                "categoria": estoque_db.categoria,
+                "validade_dias": estoque_db.validade_dias
+            }
+
+            estoque_db.ID_Fornecedor = estoque_req.ID_Fornecedor
+            estoque_db.ID_Produto = estoque_req.ID_Produto
+            estoque_db.quantidade = estoque_req.quantidade
+            estoque_db.categoria = estoque_req.categoria
+            estoque_db.validade_dias = estoque_req.validade_dias
+
+            await db.commit()
+        except SQLAlchemyError as e:
+            await db.rollback()
+            raise HTTPException(status_code=HTTPStatus.INTERNAL_SERVER_ERROR, detail=f"Erro ao atualizar o estoque no banco de dados: {str(e)}")
+        else:
+            return estoque_antigo
+
+    @router.delete('/{id_estoque}')
+    async def delete_estoque(id_estoque: int, db: AsyncSession = Depends(get_db_async)):
+        if not id_estoque:
+            raise HTTPException(status_code=HTTPStatus.BAD_REQUEST, detail='ID inválido')
+
+        try:
+            del_estoque = await db.get(Estoque, id_estoque)
+            if del_estoque is None:
+                raise HTTPException(status_code=HTTPStatus.BAD_REQUEST, detail='ID não encontrado')
+            await db.delete(del_estoque)
+            await db.commit()
+        except SQLAlchemyError as e:
+            await db.rollback()
+            raise HTTPException(status_code=HTTPStatus.INTERNAL_SERVER_ERROR, detail=f"Erro ao excluir o estoque no banco de dados: {str(e)}")
+        else:
+            return del_estoque
+
+    return router
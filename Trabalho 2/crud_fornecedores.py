@@ -6,7 +6,7 @@ from db_models import Fornecedores
 from http import HTTPStatus
 from sqlalchemy.exc import SQLAlchemyError
 from decimal import Decimal
-from pagination import PaginationParams
+from pagination import PaginationParams, consulta_pagina, parametros_paginacao, monta_pagina, total_linhas
 
 
 class FornecedorPy(BaseModel):
@@ -24,29 +24,18 @@ class FornecedorPy(BaseModel):
             raise ValueError('O valor unitário não pode ter mais de 2 casas decimais.')
         return value
     
-def route_fornecedores(pref: str):
+def route_fornecedores(pref: str, contador):
     router = APIRouter(prefix=f'/{pref}', tags=[pref])
 
+    # Paginação por keyset na PK; /todos mantém a listagem completa que antes ocupava a mesma rota '/'
     @router.get('/')
+    def get_all_fornecedores_pagination(pag: PaginationParams = Depends(parametros_paginacao), db: Session = Depends(get_db)):
+        fornecedores = db.scalars(consulta_pagina(Fornecedores, pag)).all()
+        return monta_pagina(fornecedores, Fornecedores, pag, total_linhas(db, contador, Fornecedores, pag.total), 'fornecedores')
+
+    @router.get('/todos')
     def get_all_fornecedores(db: Session = Depends(get_db)):
         return db.query(Fornecedores).order_by(Fornecedores.ID_Fornecedor).all()
-    
-    @router.get('/')
-    def get_all_fornecedores_pagination(pag: PaginationParams = Depends(), db: Session = Depends(get_db)):
-        offset = (pag.page - 1) * pag.limit
-        fornecedores = db.query(Fornecedores).offset(offset).limit(pag.limit).all()
-        total_fornecedores = db.query(Fornecedores).count()
-        total_pages = (total_fornecedores + pag.limit - 1) // pag.limit
-        
-        return {
-            'data': fornecedores,
-            'pagination': {
-                'page': pag.page,
-                'limit': pag.limit,
-                'total_fornecedores': total_fornecedores,
-                'total_pages': total_pages
-            }
-        }
 
     @router.get('/{id_fornecedor}')
     def get_fornecedor(id_fornecedor: int, db: Session = Depends(get_db)):
@@ -0,0 +1,109 @@
+from fastapi import Depends, HTTPException, APIRouter
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from db_connect_async import get_db_async
+from db_models import Fornecedores
+from http import HTTPStatus
+from sqlalchemy.exc import SQLAlchemyError
+from pagination import PaginationParams, consulta_pagina, parametros_paginacao, monta_pagina, total_linhas_async
+from crud_fornecedores import FornecedorPy
+
+def route_fornecedores_async(pref: str, contador):
+    router = APIRouter(prefix=f'/{pref}', tags=[pref])
+
+    @router.get('/')
+    async def get_all_fornecedores_pagination(pag: PaginationParams = Depends(parametros_paginacao), db: AsyncSession = Depends(get_db_async)):
+        fornecedores = (await db.scalars(consulta_pagina(Fornecedores, pag))).all()
+        total = await total_linhas_async(db, contador, Fornecedores, pag.total)
+        return monta_pagina(fornecedores, Fornecedores, pag, total, 'fornecedores')
+
+    @router.get('/todos')
+    async def get_all_fornecedores(db: AsyncSession = Depends(get_db_async)):
+        return (await db.scalars(select(Fornecedores).order_by(Fornecedores.ID_Fornecedor))).all()
+
+    @router.get('/{id_fornecedor}')
+    async def get_fornecedor(id_fornecedor: int, db: AsyncSession = Depends(get_db_async)):
+        if not id_fornecedor:
+            raise HTTPException(status_code=HTTPStatus.BAD_REQUEST, detail='ID inválido')
+
+        try:
+            query = await db.get(Fornecedores, id_fornecedor)
+            if query is None:
+                raise HTTPException(status_code=HTTPStatus.BAD_REQUEST, detail='ID não encontrado')
+        except HTTPException as e:
+            raise HTTPException(status_code=HTTPStatus.BAD_REQUEST, detail=f'Erro ao retornar o fornecedor. Erro: {str(e)}')
+        return query
+
+    @router.post('/')
+    async def create_fornecedor(fornecedor_req: FornecedorPy, db: AsyncSession = Depends(get_db_async)):
+        if not fornecedor_req.nome:
+            raise HTTPException(status_code=HTTPStatus.BAD_REQUEST, detail="O nome do fornecedor não pode estar vazio.")
+        if fornecedor_req.quantidade <= 0:
+            raise HTTPException(status_code=HTTPStatus.BAD_REQUEST, detail="A quantidade deve ser maior que zero.")
+        if fornecedor_req.valor_unitario <= 0:
+            raise HTTPException(status_code=HTTPStatus.BAD_REQUEST, detail="O valor unitário deve ser maior que zero.")
+
+        try:
+            fornecedor = Fornecedores(
+                nome=fornecedor_req.nome,
+                ID_Produto=fornecedor_req.ID_Produto,
+                quantidade=fornecedor_req.quantidade,
+                valor_unitario=fornecedor_req.valor_unitario
+            )
+            db.add(fornecedor)
+            await db.commit()
+            await db.refresh(fornecedor)
+        except SQLAlchemyError as e:
+            await db.rollback()
+            raise HTTPException(status_code=HTTPStatus.INTERNAL_SERVER_ERROR, detail=f"Erro ao criar fornecedor no banco de dados: {str(e)}")
+        else:
+            return fornecedor
+
+    @router.put('/{id_fornecedor}')
+    async def update_fornecedor(id_fornecedor: int, fornecedor_req: FornecedorPy, db: AsyncSession = Depends(get_db_async)):
+        if not id_fornecedor:
+            raise HTTPException(status_code=HTTPStatus.BAD_REQUEST, detail='ID inválido')
+
+        try:
+            fornecedor_db = await db.get(Fornecedores, id_fornecedor)
+            if fornecedor_db is None:
+                raise HTTPException(status_code=HTTPStatus.BAD_REQUEST, detail='ID não encontrado')
+
+            fornecedor_antigo = {
+                "ID_Fornecedor": fornecedor_db.ID_Fornecedor,
+                "nome": fornecedor_db.nome,
+                "ID_Produto": fornecedor_db.ID_Produto,
+                "quantidade": fornecedor_db.quantidade,
+                "valor_unitario": fornecedor_db.valor_unitario
+            }
+
+            fornecedor_db.nome = fornecedor_req.nome
+            fornecedor_db.ID_Produto = fornecedor_req.ID_Produto
+            fornecedor_db.quantidade = fornecedor_req.quantidade
+            fornecedor_db.valor_unitario = fornecedor_req.valor_unitario
+
+            await db.commit()
+        except SQLAlchemyError as e:
+            await db.rollback()
+            raise HTTPException(status_code=HTTPStatus.INTERNAL_SERVER_ERROR, detail=f"Erro ao atualizar o fornecedor no banco de dados: {str(e)}")
+        else:
+            return fornecedor_antigo
+
+    @router.delete('/{id_fornecedor}')
+    async def delete_fornecedor(id_fornecedor: int, db: AsyncSession = Depends(get_db_async)):
+        if not id_fornecedor:
+            raise HTTPException(status_code=HTTPStatus.BAD_REQUEST, detail='ID inválido')
+
+        try:
+            del_fornecedor = await db.get(Fornecedores, id_fornecedor)
+            if del_fornecedor is None:
+                raise HTTPException(status_code=HTTPStatus.BAD_REQUEST, detail='ID não encontrado')
+            await db.delete(del_fornecedor)
+            await db.commit()
+        except SQLAlchemyError as e:
+            await db.rollback()
+            raise HTTPException(status_code=HTTPStatus.INTERNAL_SERVER_ERROR, detail=f"Erro ao excluir o fornecedor no banco de dados: {str(e)}")
+        else:
+            return del_fornecedor
+
+    return router
@@ -6,7 +6,7 @@ from db_models import Produtos
 from http import HTTPStatus
 from sqlalchemy.exc import SQLAlchemyError
 from decimal import Decimal
-from pagination import PaginationParams
+from pagination import PaginationParams, consulta_pagina, parametros_paginacao, monta_pagina, total_linhas
 
 class ProdutoPy(BaseModel):
     nome: str
@@ -21,21 +21,18 @@ class ProdutoPy(BaseModel):
             raise ValueError('O valor unitário não pode ter mais de 2 casas decimais.')
         return value
 
-def route_produtos(pref: str):
+def route_produtos(pref: str, contador):
     router = APIRouter(prefix=f'/{pref}', tags=[pref])
 
+    # Paginação por keyset na PK; /todos mantém a listagem completa que antes ocupava a mesma rota '/'
     @router.get('/')
+    def get_all_produtos_pagination(pag: PaginationParams = Depends(parametros_paginacao), db: Session = Depends(get_db)):
+        produtos = db.scalars(consulta_pagina(Produtos, pag)).all()
+        return monta_pagina(produtos, Produtos, pag, total_linhas(db, contador, Produtos, pag.total), 'produtos')
+
+    @router.get('/todos')
     def get_all_produtos(db: Session = Depends(get_db)):
         return db.query(Produtos).order_by(Produtos.ID_Produto).all()
-    
-    @router.get('/')
-    def get_all_produtos_pagination(pag: PaginationParams = Depends(), db: Session = Depends(get_db)):
-        offset = (pag.page - 1) * pag.limit
-        produtos = db.query(Produtos).offset(offset).limit(pag.limit).all()
-        total_produtos = db.query(Produtos).count()
-        total_pages = (total_produtos + pag.limit - 1) // pag.limit
-        
-        return {'data': produtos, 'pagination': {'page': pag.page, 'limit': pag.limit, 'total_produtos': total_produtos, 'total_pages': total_pages}}
 
     @router.get('/{id_produto}')
     def get_produto(id_produto: int, db: Session = Depends(get_db)):
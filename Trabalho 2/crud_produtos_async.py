@@ -0,0 +1,100 @@
+from fastapi import Depends, HTTPException, APIRouter
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from db_connect_async import get_db_async
+from db_models import Produtos
+from http import HTTPStatus
+from sqlalchemy.exc import SQLAlchemyError
+from pagination import PaginationParams, consulta_pagina, parametros_paginacao, monta_pagina, total_linhas_async
+from crud_produtos import ProdutoPy
+
+def route_produtos_async(pref: str, contador):
+    router = APIRouter(prefix=f'/{pref}', tags=[pref])
+
+    @router.get('/')
+    async def get_all_produtos_pagination(pag: PaginationParams = Depends(parametros_paginacao), db: AsyncSession = Depends(get_db_async)):
+        produtos = (await db.scalars(consulta_pagina(Produtos, pag))).all()
+        total = await total_linhas_async(db, contador, Produtos, pag.total)
+        return monta_pagina(produtos, Produtos, pag, total, 'produtos')
+
+    @router.get('/todos')
+    async def get_all_produtos(db: AsyncSession = Depends(get_db_async)):
+        return (await db.scalars(select(Produtos).order_by(Produtos.ID_Produto))).all()
+
+    @router.get('/{id_produto}')
+    async def get_produto(id_produto: int, db: AsyncSession = Depends(get_db_async)):
+        if not id_produto:
+            raise HTTPException(status_code=HTTPStatus.BAD_REQUEST, detail='ID inválido')
+
+        try:
+            query = await db.get(Produtos, id_produto)
+            if query is None:
+                raise HTTPException(status_code=HTTPStatus.BAD_REQUEST, detail='ID não encontrado')
+        except HTTPException as e:
+            raise HTTPException(status_code=HTTPStatus.BAD_REQUEST, detail=f'Erro ao retornar o produto. Erro: {str(e)}')
+        return query
+
+    @router.post('/')
+    async def create_produto(produto_req: ProdutoPy, db: AsyncSession = Depends(get_db_async)):
+        if not produto_req.nome:
+            raise HTTPException(status_code=HTTPStatus.BAD_REQUEST,detail="O nome do produto não pode estar vazio.")
+        if produto_req.valor_unitario <= 0:
+            raise HTTPException(status_code=HTTPStatus.BAD_REQUEST,detail="O valor unitário deve ser maior que zero.")
+
+        try:
+            produto = Produtos(nome=produto_req.nome, valor_unitario=produto_req.valor_unitario)
+            db.add(produto)
+            await db.commit()
+            await db.refresh(produto)
+        except SQLAlchemyError as e:
+            await db.rollback()
+            raise HTTPException(status_code=HTTPStatus.INTERNAL_SERVER_ERROR, detail=f"Erro ao criar produto no banco de dados: {str(e)}")
+        else:
+            return produto
+
+    @router.put('/{id_produto}')
+    async def update_produto(id_produto: int, produto_req: ProdutoPy, db: AsyncSession = Depends(get_db_async)):
+        if not id_produto:
+            raise HTTPException(status_code=HTTPStatus.BAD_REQUEST, detail='ID inválido')
+
+        try:
+            produto_db = await db.get(Produtos, id_produto)
+            if produto_db is None:
+                raise HTTPException(status_code=HTTPStatus.BAD_REQUEST, detail='ID não encontrado')
+
+            produto_antigo = {
+                "ID_Produto": produto_db.ID_Produto,
+                "nome": produto_db.nome,
+                "valor_unitario": produto_db.valor_unitario
+            }
+
+            if produto_db.nome is not None:
+                produto_db.nome = produto_req.nome
+            if produto_db.valor_unitario is not None:
+                produto_db.valor_unitario = produto_req.valor_unitario
+
+            await db.commit()
+        except SQLAlchemyError as e:
+            await db.rollback()
+            raise HTTPException(status_code=HTTPStatus.INTERNAL_SERVER_ERROR, detail=f"Erro ao atualizar o produto no banco de dados: {str(e)}")
+        else:
+            return produto_antigo
+
+    @router.delete('/{id_produto}')
+    async def delete_produto(id_produto: int, db: AsyncSession = Depends(get_db_async)):
+        if not id_produto:
+            raise HTTPException(status_code=HTTPStatus.BAD_REQUEST, detail='ID inválido')
+
+        try:
+            del_produto = await db.get(Produtos, id_produto)
+            if del_produto is None:
+                raise HTTPException(status_code=HTTPStatus.BAD_REQUEST, detail='ID não encontrado')
+            await db.delete(del_produto)
+            await db.commit()
+        except SQLAlchemyError as e:
+            await db.rollback()
+            raise HTTPException(status_code=HTTPStatus.INTERNAL_SERVER_ERROR, detail=f"Erro ao excluir o produto no banco de dados: {str(e)}")
+        else:
+            return del_produto
+
+    return router
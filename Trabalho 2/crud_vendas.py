@@ -6,7 +6,7 @@ from db_models import Vendas
 from http import HTTPStatus
 from sqlalchemy.exc import SQLAlchemyError
 from decimal import Decimal
-from pagination import PaginationParams
+from pagination import PaginationParams, consulta_pagina, parametros_paginacao, monta_pagina, total_linhas
 
 class VendaPy(BaseModel):
     ID_Cliente: int
@@ -29,29 +29,18 @@ class VendaPy(BaseModel):
             raise ValueError('O valor total não pode ter mais de 2 casas decimais.')
         return value
 
-def route_vendas(pref: str):
+def route_vendas(pref: str, contador):
     router = APIRouter(prefix=f'/{pref}', tags=[pref])
 
+    # Paginação por keyset na PK; /todos mantém a listagem completa que antes ocupava a mesma rota '/'
     @router.get('/')
+    def get_all_vendas_pagination(pag: PaginationParams = Depends(parametros_paginacao), db: Session = Depends(get_db)):
+        vendas = db.scalars(consulta_pagina(Vendas, pag)).all()
+        return monta_pagina(vendas, Vendas, pag, total_linhas(db, contador, Vendas, pag.total), 'vendas')
+
+    @router.get('/todos')
     def get_all_vendas(db: Session = Depends(get_db)):
         return db.query(Vendas).order_by(Vendas.ID_Venda).all()
-    
-    @router.get('/')
-    def get_all_vendas_pagination(pag: PaginationParams = Depends(), db: Session = Depends(get_db)):
-        offset = (pag.page - 1) * pag.limit
-        vendas = db.query(Vendas).offset(offset).limit(pag.limit).all()
-        total_vendas = db.query(Vendas).count()
-        total_pages = (total_vendas + pag.limit - 1) // pag.limit
-        
-        return {
-            'data': vendas,
-            'pagination': {
-                'page': pag.page,
-                'limit': pag.limit,
-                'total_vendas': total_vendas,
-                'total_pages': total_pages
-            }
-        }
 
     @router.get('/{id_venda}')
     def get_venda(id_venda: int, db: Session = Depends(get_db)):
@@ -0,0 +1,105 @@
+from fastapi import Depends, HTTPException, APIRouter
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from db_connect_async import get_db_async
+from db_models import Vendas
+from http import HTTPStatus
+from sqlalchemy.exc import SQLAlchemyError
+from pagination import PaginationParams, consulta_pagina, parametros_paginacao, monta_pagina, total_linhas_async
+from crud_vendas import VendaPy
+
+def route_vendas_async(pref: str, contador):
+    router = APIRouter(prefix=f'/{pref}', tags=[pref])
+
+    @router.get('/')
+    async def get_all_vendas_pagination(pag: PaginationParams = Depends(parametros_paginacao), db: AsyncSession = Depends(get_db_async)):
+        vendas = (await db.scalars(consulta_pagina(Vendas, pag))).all()
+        total = await total_linhas_async(db, contador, Vendas, pag.total)
+        return monta_pagina(vendas, Vendas, pag, total, 'vendas')
+
+    @router.get('/todos')
+    async def get_all_vendas(db: AsyncSession = Depends(get_db_async)):
+        return (await db.scalars(select(Vendas).order_by(Vendas.ID_Venda))).all()
+
+    @router.get('/{id_venda}')
+    async def get_venda(id_venda: int, db: AsyncSession = Depends(get_db_async)):
+        if not id_venda:
+            raise HTTPException(status_code=HTTPStatus.BAD_REQUEST, detail='ID inválido')
+
+        try:
+            query = await db.get(Vendas, id_venda)
+            if query is None:
+                raise HTTPException(status_code=HTTPStatus.BAD_REQUEST, detail='ID não encontrado')
+        except HTTPException as e:
+            raise HTTPException(status_code=HTTPStatus.BAD_REQUEST, detail=f'Erro ao retornar a venda. Erro: {str(e)}')
+        return query
+
+    @router.post('/')
+    async def create_venda(venda_req: VendaPy, db: AsyncSession = Depends(get_db_async)):
+        if not venda_req.ID_Cliente or not venda_req.ID_Produto:
+            raise HTTPException(status_code=HTTPStatus.BAD_REQUEST, detail="ID do cliente e do produto são obrigatórios.")
+
+        try:
+            venda = Vendas(
+                ID_Cliente=venda_req.ID_Cliente,
+                ID_Produto=venda_req.ID_Produto,
+                quantidade=venda_req.quantidade,
+                valor_total=venda_req.valor_total
+            )
+            db.add(venda)
+            await db.commit()
+            await db.refresh(venda)
+        except SQLAlchemyError as e:
+            await db.rollback()
+            raise HTTPException(status_code=HTTPStatus.INTERNAL_SERVER_ERROR, detail=f"Erro ao criar venda no banco de dados: {str(e)}")
+        else:
+            return venda
+
+    @router.put('/{id_venda}')
+    async def update_venda(id_venda: int, venda_req: VendaPy, db: AsyncSession = Depends(get_db_async)):
+        if not id_venda:
+            raise HTTPException(status_code=HTTPStatus.BAD_REQUEST, detail='ID inválido')
+
+        try:
+            venda_db = await db.get(Vendas, id_venda)
+            if venda_db is None:
+                raise HTTPException(status_code=HTTPStatus.BAD_REQUEST, detail='ID não encontrado')
+
+            venda_antigo = {
+                "ID_Venda": venda_db.ID_Venda,
+                "ID_Cliente": venda_db.ID_Cliente,
+                "ID_Produto": venda_db.ID_Produto,
+                "quantidade": venda_db.quantidade,
+                "valor_total": venda_db.valor_total
+            }
+
+            venda_db.ID_Cliente = venda_req.ID_Cliente
+            venda_db.ID_Produto = venda_req.ID_Produto
+            venda_db.quantidade = venda_req.quantidade
+            venda_db.valor_total = venda_req.valor_total
+
+            await db.commit()
+        except SQLAlchemyError as e:
+            await db.rollback()
+            raise HTTPException(status_code=HTTPStatus.INTERNAL_SERVER_ERROR, detail=f"Erro ao atualizar a venda no banco de dados: {str(e)}")
+        else:
+            return venda_antigo
+
+    @router.delete('/{id_venda}')
+    async def delete_venda(id_venda: int, db: AsyncSession = Depends(get_db_async)):
+        if not id_venda:
+            raise HTTPException(status_code=HTTPStatus.BAD_REQUEST, detail='ID inválido')
+
+        try:
+            del_venda = await db.get(Vendas, id_venda)
+            if del_venda is None:
+                raise HTTPException(status_code=HTTPStatus.BAD_REQUEST, detail='ID não encontrado')
+            await db.delete(del_venda)
+            await db.commit()
+        except SQLAlchemyError as e:
+            await db.rollback()
+            raise HTTPException(status_code=HTTPStatus.INTERNAL_SERVER_ERROR, detail=f"Erro ao excluir a venda no banco de dados: {str(e)}")
+        else:
+            return del_venda
+
+    return router
@@ -1,10 +1,15 @@
-from sqlalchemy import create_engine, URL
+from sqlalchemy import create_engine, event, insert, select, URL
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
 from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import QueuePool
 import db_models
 import yaml
 import json
+import io
 import os
 import logging as log
+import threading
+import time
 
 def get_config():
     curr_dir = os.path.abspath(os.path.dirname(__file__))
@@ -31,8 +36,108 @@ config = get_config()
 db_connection = config['db_connection']
 dbname, host, port, user, password = db_connection["database"], db_connection["host"], db_connection["port"], db_connection["user"], db_connection["password"]
 
-url_conn = URL.create("postgresql+psycopg2", username = user, password = password, host = host, database = dbname, query={'client_encoding': 'utf8'})
-engine = create_engine(url=url_conn)
+class MetricasPool:
+    # Contadores do pool alimentados pelos eventos do SQLAlchemy e pela espera medida no QueuePoolMedido
+    def __init__(self):
+        self._trava = threading.Lock()
+        self.conexoes_criadas = 0
+        self.invalidadas = 0
+        self.checkouts = 0
+        self.checkins = 0
+        self.em_uso = 0
+        self.max_em_uso = 0
+        self.timeouts = 0
+        self.espera_total = 0.0
+        self.espera_max = 0.0
+
+    def registra_espera(self, segundos, timeout=False):
+        with self._trava:
+            self.espera_total += segundos
+            self.espera_max = max(self.espera_max, segundos)
+            if timeout:
+                self.timeouts += 1
+
+    def registra_checkout(self):
+        with self._trava:
+            self.checkouts += 1
+            self.em_uso += 1
+            self.max_em_uso = max(self.max_em_uso, self.em_uso)
+
+    def registra_checkin(self):
+        with self._trava:
+            self.checkins += 1
+            self.em_uso -= 1
+
+    def registra_conexao(self):
+        with self._trava:
+            self.conexoes_criadas += 1
+
+    def registra_invalidacao(self):
+        with self._trava:
+            self.invalidadas += 1
+
+    def resumo(self, pool=None):
+        with self._trava:
+            resumo = {
+                'conexoes_criadas': self.conexoes_criadas,
+                'invalidadas': self.invalidadas,
+                'checkouts': self.checkouts,
+                'checkins': self.checkins,
+                'em_uso': self.em_uso,
+                'max_em_uso': self.max_em_uso,
+                'timeouts': self.timeouts,
+                'espera_media_ms': round(self.espera_total / self.checkouts * 1000, 3) if self.checkouts else 0.0,
+                'espera_max_ms': round(self.espera_max * 1000, 3),
+            }
+        if isinstance(pool, QueuePool):
+            resumo.update({'tamanho': pool.size(), 'livres': pool.checkedin(), 'emprestadas': pool.checkedout(), 'overflow': pool.overflow()})
+        return resumo
+
+metricas_pool = MetricasPool()
+
+class MedeEsperaPool:
+    # O SQLAlchemy não tem evento para o início do checkout; _do_get é onde o pool espera por uma conexão livre
+    metricas = metricas_pool
+
+    def _do_get(self):
+        inicio = time.perf_counter()
+        try:
+            conexao = super()._do_get()
+        except PoolTimeoutError:
+            self.metricas.registra_espera(time.perf_counter() - inicio, timeout=True)
+            raise
+        self.metricas.registra_espera(time.perf_counter() - inicio)
+        return conexao
+
+class QueuePoolMedido(MedeEsperaPool, QueuePool):
+    pass
+
+def registra_eventos_pool(engine, metricas=metricas_pool):
+    event.listen(engine, 'connect', lambda conexao, registro: metricas.registra_conexao())
+    event.listen(engine, 'checkout', lambda conexao, registro, proxy: metricas.registra_checkout())
+    event.listen(engine, 'checkin', lambda conexao, registro: metricas.registra_checkin())
+    event.listen(engine, 'invalidate', lambda conexao, registro, excecao: metricas.registra_invalidacao())
+
+def opcoes_engine(db_connection, asyncpg=False):
+    # Bloco db_connection.pool do config.yaml; chave ausente fica no padrão do SQLAlchemy
+    pool = db_connection.get('pool') or {}
+    opcoes = {chave: pool[chave] for chave in ('pool_size', 'max_overflow', 'pool_timeout', 'pool_recycle', 'pool_pre_ping', 'pool_use_lifo') if chave in pool}
+    # statement_timeout vai como parâmetro da sessão no PostgreSQL, aplicado em cada conexão nova
+    statement_timeout = pool.get('statement_timeout_ms')
+    if statement_timeout:
+        if asyncpg:
+            opcoes['connect_args'] = {'server_settings': {'statement_timeout': str(int(statement_timeout))}}
+        else:
+            opcoes['connect_args'] = {'options': f'-c statement_timeout={int(statement_timeout)}'}
+    return opcoes
+
+def cria_engine(url, db_connection):
+    engine = create_engine(url=url, poolclass=QueuePoolMedido, **opcoes_engine(db_connection))
+    registra_eventos_pool(engine)
+    return engine
+
+url_conn = URL.create("postgresql+psycopg2", username = user, password = password, host = host, port = int(port), database = dbname, query={'client_encoding': 'utf8'})
+engine = cria_engine(url_conn, db_connection)
 
 db_session = sessionmaker(bind=engine, autoflush=False, autocommit=False)
 
@@ -53,6 +158,13 @@ def cria_tabelas():
         inserir_dados(db)
 
 
+def modo_execucao():
+    # sync (Session nas threads do FastAPI) ou async (AsyncSession); a variável de ambiente tem prioridade sobre o YAML
+    modo = os.environ.get('TRABALHO2_MODO') or db_connection.get('modo', 'sync')
+    if modo not in ('sync', 'async'):
+        raise ValueError(f'Modo inválido em db_connection.modo: {modo}')
+    return modo
+
 def get_db():
     db = db_session()
     try:
@@ -60,53 +172,85 @@ def get_db():
     finally:
         db.close()
         
-def existe_elemento(db, model, pk):
-    try:
-        return db.get(model, pk) is not None
-    except Exception as e:
-        log.error(f"Erro ao validar existência do elemento: {e}")
-        return False
+TAMANHO_LOTE_SEED = 5000
+
+# Coluna do modelo -> chave no arquivo data_json
+MAPEAMENTO_JSON = {
+    db_models.Produtos: {'ID_Produto': 'ID_Produto', 'nome': 'Nome', 'valor_unitario': 'Valor_Unitario'},
+    db_models.Clientes: {'ID_Cliente': 'ID_Cliente', 'forma_pagamento': 'Forma_Pagamento', 'programa_fidelidade': 'Programa_Fidelidade'},
+    db_models.Fornecedores: {'ID_Fornecedor': 'ID_Fornecedor', 'nome': 'Nome', 'ID_Produto': 'ID_Produto', 'quantidade': 'Quantidade', 'valor_unitario': 'Valor_Unitario'},
+    db_models.Estoque: {'ID_Estoque': 'ID_Estoque', 'ID_Fornecedor': 'ID_Fornecedor', 'ID_Produto': 'ID_Produto', 'quantidade': 'Quantidade', 'categoria': 'Categoria', 'validade_dias': 'Validade_Dias'},
+    db_models.Vendas: {'ID_Venda': 'ID_Venda', 'ID_Cliente': 'ID_Cliente', 'ID_Produto': 'ID_Produto', 'quantidade': 'Quantidade', 'valor_total': 'Valor_Total'},
+}
+
+def ids_existentes(db, model, ids, tamanho_lote=TAMANHO_LOTE_SEED):
+    # Uma consulta IN por lote em vez de um db.get por registro
+    pk = model.__mapper__.primary_key[0]
+    existentes = set()
+    for inicio in range(0, len(ids), tamanho_lote):
+        existentes.update(db.scalars(select(pk).where(pk.in_(ids[inicio:inicio + tamanho_lote]))))
+    return existentes
+
+# Formato texto do COPY: NULL é \N e barra invertida, tab e quebras de linha vão escapados
+ESCAPES_COPY = str.maketrans({'\\': '\\\\', '\t': '\\t', '\n': '\\n', '\r': '\\r'})
+
+def campo_copy(valor):
+    if valor is None:
+        return '\\N'
+    return str(valor).translate(ESCAPES_COPY)
+
+def linhas_copy(linhas, colunas):
+    return ''.join('\t'.join(campo_copy(linha[coluna]) for coluna in colunas) + '\n' for linha in linhas)
+
+def copia_postgres(db, model, linhas):
+    # COPY ... FROM STDIN: o caminho mais rápido de carga no PostgreSQL.
+    # No CSV um None sai como "" e o COPY grava texto vazio; no formato texto o \N chega como NULL.
+    tabela = model.__table__
+    preparador = db.get_bind().dialect.identifier_preparer
+    colunas = list(linhas[0].keys())
+    buffer = io.StringIO(linhas_copy(linhas, colunas))
+    sql = f"COPY {preparador.format_table(tabela)} ({', '.join(preparador.quote(coluna) for coluna in colunas)}) FROM STDIN"
+    with db.connection().connection.cursor() as cursor:
+        cursor.copy_expert(sql, buffer)
+
+def insere_em_lote(db, model, linhas, tamanho_lote=TAMANHO_LOTE_SEED):
+    if not linhas:
+        return
+    if db.get_bind().dialect.name == 'postgresql':
+        for inicio in range(0, len(linhas), tamanho_lote * 20):
+            copia_postgres(db, model, linhas[inicio:inicio + tamanho_lote * 20])
+        return
     
-def create_produtos(db, file_json):
+    for inicio in range(0, len(linhas), tamanho_lote):
+        db.execute(insert(model.__table__), linhas[inicio:inicio + tamanho_lote])
+
+def carrega_json_em_lote(db, model, file_json):
+    # Lê o arquivo uma vez, descobre quais PKs já existem e insere só o resto
+    mapeamento = MAPEAMENTO_JSON[model]
+    pk = model.__mapper__.primary_key[0].name
     with open(file_json, "r", encoding='utf-8') as file:
-        data = file.read()
-        data = json.loads(data)
-        for produto in data:
-            if not existe_elemento(db, db_models.Produtos, produto['ID_Produto']):
-                db.add(db_models.Produtos(ID_Produto=produto["ID_Produto"], nome=produto["Nome"], valor_unitario=produto["Valor_Unitario"]))
+        data = json.load(file)
+    
+    linhas = [{coluna: registro[chave] for coluna, chave in mapeamento.items()} for registro in data]
+    existentes = ids_existentes(db, model, [linha[pk] for linha in linhas])
+    novas = [linha for linha in linhas if linha[pk] not in existentes]
+    insere_em_lote(db, model, novas)
+    return len(novas)
+
+def create_produtos(db, file_json):
+    return carrega_json_em_lote(db, db_models.Produtos, file_json)
 
 def create_clientes(db, file_json):
-    with open(file_json, "r", encoding='utf-8') as file:
-        data = file.read()
-        data = json.loads(data)
-        for cliente in data:
-            if not existe_elemento(db, db_models.Clientes, cliente['ID_Cliente']):
-                db.add(db_models.Clientes(ID_Cliente=cliente["ID_Cliente"], forma_pagamento=cliente['Forma_Pagamento'], programa_fidelidade=cliente["Programa_Fidelidade"]))
+    return carrega_json_em_lote(db, db_models.Clientes, file_json)
 
 def create_fornecedores(db, file_json):
-    with open(file_json, "r", encoding='utf-8') as file:
-        data = file.read()
-        data = json.loads(data)
-        for fornecedor in data:
-            if not existe_elemento(db, db_models.Fornecedores, fornecedor['ID_Fornecedor']):
-                db.add(db_models.Fornecedores(ID_Fornecedor=fornecedor["ID_Fornecedor"], nome=fornecedor["Nome"], ID_Produto=fornecedor["ID_Produto"], quantidade=fornecedor["Quantidade"], valor_unitario=fornecedor["Valor_Unitario"]))
+    return carrega_json_em_lote(db, db_models.Fornecedores, file_json)
 
 def create_estoque(db, file_json):
-    with open(file_json, "r", encoding='utf-8') as file:
-        data = file.read()
-        data = json.loads(data)
-        for estoque in data:
-            if not existe_elemento(db, db_models.Estoque, estoque['ID_Estoque']):
-                db.add(db_models.Estoque(ID_Estoque=estoque["ID_Estoque"], ID_Fornecedor=estoque["ID_Fornecedor"], ID_Produto=estoque["ID_Produto"], quantidade=estoque["Quantidade"], categoria=estoque["Categoria"], validade_dias=estoque["Validade_Dias"]))
+    return carrega_json_em_lote(db, db_models.Estoque, file_json)
 
 def create_vendas(db, file_json):
-    with open(file_json, "r", encoding='utf-8') as file:
-        data = file.read()
-        data = json.loads(data)
-        for venda in data:
-            if not existe_elemento(db, db_models.Vendas, venda['ID_Venda']):
-                db.add(db_models.Vendas(ID_Venda=venda["ID_Venda"], ID_Cliente=venda["ID_Cliente"], ID_Produto=venda["ID_Produto"], quantidade=venda["Quantidade"], valor_total=venda["Valor_Total"]))
-            
+    return carrega_json_em_lote(db, db_models.Vendas, file_json)
 
 def inserir_dados(db):
     config = get_config()
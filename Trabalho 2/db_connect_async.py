@@ -0,0 +1,27 @@
+from sqlalchemy import URL
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+from db_connect import db_connection, dbname, host, port, user, password, opcoes_engine, registra_eventos_pool, MedeEsperaPool, MetricasPool
+
+# Mesmo banco e mesmo bloco de pool do config.yaml, com o driver asyncpg no lugar do psycopg2
+
+metricas_pool_async = MetricasPool()
+
+class AsyncQueuePoolMedido(MedeEsperaPool, AsyncAdaptedQueuePool):
+    metricas = metricas_pool_async
+
+def cria_engine_async(url, db_connection):
+    engine = create_async_engine(url, poolclass=AsyncQueuePoolMedido, **opcoes_engine(db_connection, asyncpg=True))
+    # Eventos de pool só existem na engine síncrona que a AsyncEngine embrulha
+    registra_eventos_pool(engine.sync_engine, metricas_pool_async)
+    return engine
+
+url_conn_async = URL.create("postgresql+asyncpg", username = user, password = password, host = host, port = int(port), database = dbname)
+async_engine = cria_engine_async(url_conn_async, db_connection)
+
+# expire_on_commit=False: depois do commit os atributos continuam carregados e a resposta não precisa de outro SELECT
+async_db_session = async_sessionmaker(bind=async_engine, autoflush=False, expire_on_commit=False)
+
+async def get_db_async():
+    async with async_db_session() as db:
+        yield db
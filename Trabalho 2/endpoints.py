@@ -1,12 +1,13 @@
 from fastapi import FastAPI, Depends, HTTPException, Request
-from sqlalchemy import func
 from sqlalchemy.orm import Session
-from db_connect import get_db
+from db_connect import get_db, engine, metricas_pool, modo_execucao
 from sqlalchemy.exc import SQLAlchemyError
 from http import HTTPStatus
 import os
 import logging as log
 import yaml
+from log_fila import configura_logging
+from contagens import ContadorEntidades, TTL_PADRAO
 
 from crud_produtos import route_produtos, Produtos
 from crud_clientes import route_clientes, Clientes
@@ -21,28 +22,16 @@ try:
     with open(config_path, 'r') as config_file:
         config = yaml.safe_load(config_file)
         log_config = config['logging']
-        path_log_file = os.path.join(curr_dir, 'config', log_config['file'])
         
-        os.makedirs(os.path.dirname(path_log_file), exist_ok=True)
-        
-        file_handler = log.FileHandler(
-            filename=path_log_file,
-            mode=log_config['filemode'],
-            encoding='utf-8'
-        )       
-        file_handler.setFormatter(log.Formatter(log_config['format']))
-        
-        log.basicConfig(
-            level=log_config['level'],
-            handlers=[file_handler, log.StreamHandler()]
-        )
+        # Logging não bloqueante: o middleware só enfileira o registro e a escrita fica com o QueueListener
+        configura_logging(log_config, pasta=os.path.join(curr_dir, 'config'), console=True)
         
         logger = log.getLogger(__name__)
         logger.info("Configurações carregadas com sucesso.")
 except Exception as e:
     log.basicConfig(level=log.INFO)
     logger = log.getLogger(__name__)
-    logger.error(f"Erro ao carregar configurações: {str(e)}")
+    logger.error("Erro ao carregar configurações: %s", e)
     raise
 else:
     log.getLogger('watchfiles.main').setLevel(log.WARNING)
@@ -51,52 +40,96 @@ app = FastAPI()
 
 @app.middleware('http')
 async def log_requisicoes(req: Request, prox_chamada):
-    logger.info(f'Iniciando a requisição: {req.method} - {req.url}')
+    logger.info('Iniciando a requisição: %s - %s', req.method, req.url)
     
     try:
         resposta = await prox_chamada(req)
     except Exception as e:
-        logger.error(f'Erro durante a requisição: {str(e)}')
+        logger.error('Erro durante a requisição: %s', e)
         raise
     else:
-        logger.info(f'Requisição concluída: {req.method} - {req.url} = Status: {resposta.status_code}')
+        logger.info('Requisição concluída: %s - %s = Status: %s', req.method, req.url, resposta.status_code)
         return resposta
 
-app.include_router(route_produtos('produtos'))
-app.include_router(route_clientes('clientes'))
-app.include_router(route_vendas('vendas'))
-app.include_router(route_fornecedores('fornecedores'))
-app.include_router(route_estoque('estoque'))
+# Contadores em memória com reconciliação a cada ttl segundos (bloco contagens do config.yaml);
+# é a mesma instância que dá o total exato das rotas paginadas
+contador = ContadorEntidades({
+    'Produtos': Produtos,
+    'Clientes': Clientes,
+    'Vendas': Vendas,
+    'Fornecedores': Fornecedores,
+    'Estoque': Estoque
+}, ttl=config.get('contagens', {}).get('ttl', TTL_PADRAO))
+
+MODO = modo_execucao()
+logger.info("Modo de execução: %s", MODO)
+
+if MODO == 'async':
+    # Importados só no modo async: criar a engine async exige o driver asyncpg instalado
+    from sqlalchemy.ext.asyncio import AsyncSession
+    from db_connect_async import get_db_async, async_engine, metricas_pool_async
+    from crud_produtos_async import route_produtos_async
+    from crud_clientes_async import route_clientes_async
+    from crud_vendas_async import route_vendas_async
+    from crud_fornecedores_async import route_fornecedores_async
+    from crud_estoque_async import route_estoque_async
+
+    app.include_router(route_produtos_async('produtos', contador))
+    app.include_router(route_clientes_async('clientes', contador))
+    app.include_router(route_vendas_async('vendas', contador))
+    app.include_router(route_fornecedores_async('fornecedores', contador))
+    app.include_router(route_estoque_async('estoque', contador))
 
-@app.get('/quantidade_entidades')
-def quantidade_entidades(db: Session = Depends(get_db)):
-    resultado = dict()
+    @app.on_event('shutdown')
+    async def fecha_engine_async():
+        await async_engine.dispose()
+else:
+    app.include_router(route_produtos('produtos', contador))
+    app.include_router(route_clientes('clientes', contador))
+    app.include_router(route_vendas('vendas', contador))
+    app.include_router(route_fornecedores('fornecedores', contador))
+    app.include_router(route_estoque('estoque', contador))
+
+def quantidade_entidades(atualizar: bool = False, db: Session = Depends(get_db)):
     logger.info("Iniciando consulta de quantidade de entidades.")
 
     try:
-        query_produtos = db.query(func.count(Produtos.ID_Produto)).scalar()
-        query_clientes = db.query(func.count(Clientes.ID_Cliente)).scalar()
-        query_vendas = db.query(func.count(Vendas.ID_Venda)).scalar()
-        query_fornecedores = db.query(func.count(Fornecedores.ID_Fornecedor)).scalar()
-        query_estoque = db.query(func.count(Estoque.ID_Estoque)).scalar()
+        resultado = contador.obtem(db, forcar=atualizar)
     except SQLAlchemyError as e:
         db.rollback()
-        logger.error(f"Erro ao consultar quantidade de entidades: {str(e)}")
+        logger.error("Erro ao consultar quantidade de entidades: %s", e)
         raise HTTPException(status_code=HTTPStatus.INTERNAL_SERVER_ERROR, detail=f"Erro ao retornar os dados. Erro: {str(e)}")
     else:
         logger.info("Consulta de quantidade de entidades concluída com sucesso.")
-        resultado.update({
-            'Produtos': query_produtos,
-            'Clientes': query_clientes,
-            'Vendas': query_vendas,
-            'Fornecedores': query_fornecedores,
-            'Estoque': query_estoque
-        })
         return resultado
 
+if MODO == 'async':
+    @app.get('/quantidade_entidades')
+    async def quantidade_entidades_async(atualizar: bool = False, db: AsyncSession = Depends(get_db_async)):
+        logger.info("Iniciando consulta de quantidade de entidades.")
+
+        try:
+            resultado = await contador.obtem_async(db, forcar=atualizar)
+        except SQLAlchemyError as e:
+            await db.rollback()
+            logger.error("Erro ao consultar quantidade de entidades: %s", e)
+            raise HTTPException(status_code=HTTPStatus.INTERNAL_SERVER_ERROR, detail=f"Erro ao retornar os dados. Erro: {str(e)}")
+        else:
+            logger.info("Consulta de quantidade de entidades concluída com sucesso.")
+            return resultado
+else:
+    app.get('/quantidade_entidades')(quantidade_entidades)
+
+@app.get('/metricas/pool')
+def get_metricas_pool():
+    # Checkouts, espera por conexão e timeouts do pool desde a subida da aplicação
+    if MODO == 'async':
+        return metricas_pool_async.resumo(async_engine.pool)
+    return metricas_pool.resumo(engine.pool)
+
 @app.get('/atributos')
 def get_atributos_especificos(entidade: str, request: Request, db: Session = Depends(get_db)):
-    logger.info(f"Iniciando consulta de atributos para a entidade: {entidade}")
+    logger.info("Iniciando consulta de atributos para a entidade: %s", entidade)
     
     entidade_modelo = {
         "produtos": Produtos,
@@ -107,7 +140,7 @@ def get_atributos_especificos(entidade: str, request: Request, db: Session = Dep
     }.get(entidade.lower())
     
     if not entidade_modelo:
-        logger.error(f"Entidade inválida: {entidade}")
+        logger.error("Entidade inválida: %s", entidade)
         raise HTTPException(
             status_code=HTTPStatus.BAD_REQUEST,
             detail=f"Entidade inválida. Entidades válidas: {list(entidade_modelo.keys())}"
@@ -122,7 +155,7 @@ def get_atributos_especificos(entidade: str, request: Request, db: Session = Dep
             if hasattr(entidade_modelo, key):
                 query = query.filter(getattr(entidade_modelo, key) == value)
             else:
-                logger.error(f"Atributo '{key}' não existe na entidade '{entidade}'")
+                logger.error("Atributo '%s' não existe na entidade '%s'", key, entidade)
                 raise HTTPException(
                     status_code=HTTPStatus.BAD_REQUEST,
                     detail=f"Atributo '{key}' não existe na entidade '{entidade}'."
@@ -131,18 +164,18 @@ def get_atributos_especificos(entidade: str, request: Request, db: Session = Dep
         resultado = query.all()
         
         if not resultado:
-            logger.warning(f"Nenhum resultado encontrado para a entidade '{entidade}' com os filtros fornecidos.")
+            logger.warning("Nenhum resultado encontrado para a entidade '%s' com os filtros fornecidos.", entidade)
             raise HTTPException(
                 status_code=HTTPStatus.NOT_FOUND,
                 detail=f"Nenhum resultado encontrado para a entidade '{entidade}' com os filtros fornecidos."
             )
         
-        logger.info(f"Consulta de atributos para a entidade '{entidade}' concluída com sucesso.")
+        logger.info("Consulta de atributos para a entidade '%s' concluída com sucesso.", entidade)
         return resultado
     
     except SQLAlchemyError as e:
         db.rollback()
-        logger.error(f"Erro ao consultar atributos da entidade '{entidade}': {str(e)}")
+        logger.error("Erro ao consultar atributos da entidade '%s': %s", entidade, e)
         raise HTTPException(
             status_code=HTTPStatus.INTERNAL_SERVER_ERROR,
             detail=f"Erro ao consultar atributos da entidade '{entidade}'. Erro: {str(e)}"
@@ -1,17 +1,92 @@
-from pydantic import BaseModel, validator
+from fastapi import HTTPException, Query
+from http import HTTPStatus
+from pydantic import BaseModel
+from sqlalchemy import select, text
+from typing import Literal, Optional
+import base64
+import binascii
+import json
+
+LIMITE_MAXIMO = 1000
 
 class PaginationParams(BaseModel):
-    page: int = 1
     limit: int = 5
+    apos: Optional[int] = None  # última chave primária já entregue, decodificada do cursor
+    total: Optional[str] = None  # None (sem total), 'estimado' (estatística do planner) ou 'exato' (ContadorEntidades)
+
+def parametros_paginacao(
+    limit: int = Query(5, ge=1, le=LIMITE_MAXIMO),
+    cursor: Optional[str] = None,
+    total: Optional[Literal['estimado', 'exato']] = None,
+):
+    # Limite e total fora da faixa viram 422 na validação da Query; cursor que não decodifica é 400.
+    # Erros levantados em validators de um modelo usado como Depends() escapavam como 500
+    apos = None
+    if cursor is not None:
+        try:
+            apos = decodifica_cursor(cursor)
+        except ValueError as e:
+            raise HTTPException(status_code=HTTPStatus.BAD_REQUEST, detail=str(e))
+    return PaginationParams(limit=limit, apos=apos, total=total)
+
+# O cursor é a última chave primária da página, em JSON e base64 url-safe para o cliente não depender do formato
+def codifica_cursor(ultimo_id):
+    return base64.urlsafe_b64encode(json.dumps({'id': ultimo_id}).encode()).decode().rstrip('=')
+
+def decodifica_cursor(cursor):
+    try:
+        ultimo_id = json.loads(base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4)))['id']
+    except (binascii.Error, ValueError, KeyError, TypeError):
+        raise ValueError('Cursor inválido.')
+    if type(ultimo_id) is not int:
+        raise ValueError('Cursor inválido.')
+    return ultimo_id
+
+def chave_primaria(model):
+    return model.__mapper__.primary_key[0]
+
+def consulta_pagina(model, pag):
+    # Keyset: WHERE pk > último id ORDER BY pk usa o índice da PK e não descarta linhas como o OFFSET.
+    # Um registro a mais diz se existe próxima página sem precisar contar.
+    pk = chave_primaria(model)
+    consulta = select(model).order_by(pk).limit(pag.limit + 1)
+    if pag.apos is not None:
+        consulta = consulta.where(pk > pag.apos)
+    return consulta
+
+def estimativa_linhas(db, model):
+    # Recebe uma Session síncrona; no modo async é chamada por AsyncSession.run_sync
+    if db.get_bind().dialect.name != 'postgresql':
+        return None
+    estimativa = db.scalar(text('SELECT reltuples::bigint FROM pg_class WHERE oid = to_regclass(:tabela)'), {'tabela': model.__tablename__})
+    # reltuples é -1 (ou 0) enquanto a tabela nunca passou por ANALYZE; aí cai no contador
+    return int(estimativa) if estimativa is not None and estimativa > 0 else None
+
+# Totais exatos vêm do mesmo ContadorEntidades do /quantidade_entidades, sem um segundo cache para invalidar
+def total_linhas(db, contador, model, modo):
+    if modo is None:
+        return None
+    if modo == 'estimado':
+        estimativa = estimativa_linhas(db, model)
+        if estimativa is not None:
+            return estimativa
+    return contador.obtem(db)[contador.nome(model)]
+
+async def total_linhas_async(db, contador, model, modo):
+    if modo is None:
+        return None
+    if modo == 'estimado':
+        estimativa = await db.run_sync(estimativa_linhas, model)
+        if estimativa is not None:
+            return estimativa
+    return (await contador.obtem_async(db))[contador.nome(model)]
 
-    @validator('page')
-    def validate_page(cls, value):
-        if value < 1:
-            raise ValueError('A página deve ser maior ou igual a 1.')
-        return value
-
-    @validator('limit')
-    def validate_limit(cls, value):
-        if value < 1:
-            raise ValueError('O tamanho da página deve ser maior ou igual a 1.')
-        return value
\ No newline at end of file
+def monta_pagina(itens, model, pag, total, nome):
+    proximo = None
+    if len(itens) > pag.limit:
+        itens = itens[:pag.limit]
+        proximo = codifica_cursor(getattr(itens[-1], chave_primaria(model).key))
+    paginacao = {'limit': pag.limit, 'next_cursor': proximo}
+    if total is not None:
+        paginacao.update({f'total_{nome}': total, 'total_pages': (total + pag.limit - 1) // pag.limit, 'total_tipo': pag.total})
+    return {'data': itens, 'pagination': paginacao}
@@ -0,0 +1,85 @@
+import os
+from types import SimpleNamespace
+from sqlalchemy import create_engine, select
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.orm import sessionmaker
+import db_models
+from db_connect import carrega_json_em_lote, copia_postgres, linhas_copy
+
+PASTA_DADOS = os.path.join(os.path.abspath(os.path.dirname(__file__)), 'data_json')
+
+# Leitura do formato texto do COPY como o PostgreSQL faz: \N é NULL, o resto é desescapado
+def le_linhas_copy(texto, colunas):
+    escapes = {'\\': '\\', 't': '\t', 'n': '\n', 'r': '\r'}
+    linhas = []
+    for linha in texto.split('\n')[:-1]:
+        campos = []
+        for campo in linha.split('\t'):
+            if campo == '\\N':
+                campos.append(None)
+                continue
+            valor, i = [], 0
+            while i < len(campo):
+                if campo[i] == '\\':
+                    valor.append(escapes[campo[i + 1]])
+                    i += 2
+                else:
+                    valor.append(campo[i])
+                    i += 1
+            campos.append(''.join(valor))
+        linhas.append(dict(zip(colunas, campos)))
+    return linhas
+
+def test_copy_distingue_null_de_texto_vazio():
+    linhas = [
+        {'ID_Cliente': '1', 'forma_pagamento': 'Pix', 'programa_fidelidade': None},
+        {'ID_Cliente': '2', 'forma_pagamento': '', 'programa_fidelidade': 'a\tb\\c\nd\re'},
+    ]
+    colunas = list(linhas[0])
+    assert le_linhas_copy(linhas_copy(linhas, colunas), colunas) == linhas
+
+class CursorFalso:
+    # Guarda o que o copia_postgres manda pelo copy_expert, no lugar do psycopg2
+    def __init__(self):
+        self.copias = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *erro):
+        return False
+
+    def copy_expert(self, sql, arquivo):
+        self.copias.append((sql, arquivo.read()))
+
+def sessao_postgres_falsa(cursor):
+    conexao = SimpleNamespace(connection=SimpleNamespace(cursor=lambda: cursor))
+    return SimpleNamespace(get_bind=lambda: SimpleNamespace(dialect=postgresql.dialect()), connection=lambda: conexao)
+
+def test_copia_postgres_manda_null_como_barra_n():
+    cursor = CursorFalso()
+    linhas = [
+        {'ID_Cliente': 1, 'forma_pagamento': 'Pix', 'programa_fidelidade': None},
+        {'ID_Cliente': 2, 'forma_pagamento': '', 'programa_fidelidade': 'Ouro'},
+    ]
+    copia_postgres(sessao_postgres_falsa(cursor), db_models.Clientes, linhas)
+
+    (sql, dados), = cursor.copias
+    assert sql == 'COPY clientes ("ID_Cliente", forma_pagamento, programa_fidelidade) FROM STDIN'
+    # Formato texto: \N é NULL e o campo vazio é texto vazio
+    assert dados == '1\tPix\t\\N\n2\t\tOuro\n'
+    assert le_linhas_copy(dados, list(linhas[0])) == [{chave: None if valor is None else str(valor) for chave, valor in linha.items()} for linha in linhas]
+
+# No SQLite a carga vai pelo executemany, não pelo COPY: aqui só se confere que o seed em lote não troca NULL
+# por texto vazio nesse caminho
+def test_seed_mantem_null_nas_colunas_opcionais(tmp_path):
+    engine = create_engine(f'sqlite:///{tmp_path / "seed.db"}')
+    db_models.Base.metadata.create_all(bind=engine)
+    with sessionmaker(bind=engine)() as db:
+        assert carrega_json_em_lote(db, db_models.Clientes, os.path.join(PASTA_DADOS, 'data_clientes.json')) == 5
+        db.commit()
+        sem_programa = db.scalars(select(db_models.Clientes.ID_Cliente).where(db_models.Clientes.programa_fidelidade.is_(None))).all()
+        # Recarga não duplica nada
+        assert carrega_json_em_lote(db, db_models.Clientes, os.path.join(PASTA_DADOS, 'data_clientes.json')) == 0
+    engine.dispose()
+    assert sorted(sem_programa) == [2, 4]
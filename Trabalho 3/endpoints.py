@@ -9,6 +9,7 @@ from crud.crud_router_estoque import router_estoque, Estoque
 from db_connect import engine as db, curr_dir, get_yaml_config
 import os
 import logging as log
+from log_fila import configura_logging
 from http import HTTPStatus
 from odmantic import ObjectId
 
@@ -16,49 +17,35 @@ yaml = get_yaml_config()
 logging = yaml['logging']
 
 try: 
-    path_log_file = os.path.join(curr_dir(), 'config', logging['file'])
-    os.makedirs(os.path.dirname(path_log_file), exist_ok=True)
-    if not os.path.exists(path_log_file):
-        with open(path_log_file, 'w') as f:
-            pass
-    
-    file_handler = log.FileHandler(
-        filename=path_log_file,
-        mode=logging['filemode'],
-        encoding='utf-8'
-    )
-    file_handler.setFormatter(log.Formatter(logging['format']))
-    log.basicConfig(level=logging['level'], handlers=[file_handler])
+    # Logging não bloqueante: o middleware só enfileira o registro e a escrita fica com o QueueListener
+    configura_logging(logging, pasta=os.path.join(curr_dir(), 'config'))
     
     logger = log.getLogger(__name__)
     logger.info('Arquivo de logging carregado com sucesso')
 except Exception as e:
     log.basicConfig(level=log.INFO)
     logger = log.getLogger(__name__)
-    logger.error(f'Erro ao carregar as informações de logging. Erro: {str(e)}')
+    logger.error('Erro ao carregar as informações de logging. Erro: %s', e)
 else:
     log.getLogger('watchfiles.main').setLevel(log.WARNING)
-    if not os.path.exists(path_log_file):
-        with open(path_log_file, 'w') as f:
-            pass
 
 app = FastAPI()
 
 @app.middleware('http')
 async def log_requisicoes(req: Request, prox_chamada):
-    logger.info(f'Iniciando a requisição: {req.method} - {req.url}')
+    logger.info('Iniciando a requisição: %s - %s', req.method, req.url)
     
     try:
         resposta = await prox_chamada(req)
     except HTTPException as e:
         detail = e.detail if isinstance(e.detail, str) else str(e.detail)
-        logger.error(f'Erro durante a requisição: {str(e)} - Detail: {detail}')
+        logger.error('Erro durante a requisição: %s - Detail: %s', e, detail)
         raise
     except Exception as e:
-        logger.error(f'Erro durante a requisição: {str(e)}')
+        logger.error('Erro durante a requisição: %s', e)
         raise HTTPException(status_code=HTTPStatus.INTERNAL_SERVER_ERROR, detail="Erro interno do servidor")
     else:
-        logger.info(f'Requisição concluída: {req.method} - {req.url} = Status: {resposta.status_code}')
+        logger.info('Requisição concluída: %s - %s = Status: %s', req.method, req.url, resposta.status_code)
         
         return resposta
 
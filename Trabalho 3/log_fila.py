@@ -0,0 +1,43 @@
+import atexit
+import logging as log
+import os
+import queue
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
+
+class QueueHandlerPreguicoso(QueueHandler):
+    # O QueueHandler padrão formata a mensagem no prepare(), ou seja, na thread que chamou o log.
+    # Como o listener roda no mesmo processo, o registro pode ir para a fila intacto e
+    # a formatação com % acontece só na thread do listener.
+    def prepare(self, record):
+        return record
+
+def configura_logging(log_config, pasta=None, console=False):
+    # log_config é o bloco 'logging' do YAML: file, level, format e, opcionais, filemode,
+    # max_bytes e backup_count (max_bytes > 0 liga a rotação por tamanho)
+    caminho = log_config['file'] if pasta is None else os.path.join(pasta, log_config['file'])
+    os.makedirs(os.path.dirname(os.path.abspath(caminho)), exist_ok=True)
+
+    max_bytes = log_config.get('max_bytes', 0)
+    if max_bytes:
+        arquivo = RotatingFileHandler(caminho, mode='a', maxBytes=max_bytes, backupCount=log_config.get('backup_count', 5), encoding='utf-8')
+    else:
+        arquivo = log.FileHandler(caminho, mode=log_config.get('filemode', 'a'), encoding='utf-8')
+
+    handlers = [arquivo, log.StreamHandler()] if console else [arquivo]
+    formatador = log.Formatter(log_config['format'])
+    for handler in handlers:
+        handler.setFormatter(formatador)
+
+    # Quem chama o log só coloca o registro na fila; a escrita em disco fica com a thread do listener
+    fila = queue.SimpleQueue()
+    listener = QueueListener(fila, *handlers, respect_handler_level=True)
+
+    raiz = log.getLogger()
+    for handler in raiz.handlers[:]:
+        raiz.removeHandler(handler)
+    raiz.addHandler(QueueHandlerPreguicoso(fila))
+    raiz.setLevel(log_config['level'])
+
+    listener.start()
+    atexit.register(listener.stop)
+    return listener
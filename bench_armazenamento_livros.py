@@ -0,0 +1,38 @@
+import os
+import random
+import sys
+import tempfile
+import time
+from bench_livros import AUTORES, gera_livros, gera_xml
+from repositorio_livros import RepositorioLivros, RepositorioLivrosSQLite
+
+def abre(tipo, pasta):
+    if tipo == 'xml':
+        arquivo = os.path.join(pasta, 'livros.xml')
+        gera_xml(arquivo, 0)
+        return RepositorioLivros(arquivo)
+    return RepositorioLivrosSQLite(os.path.join(pasta, 'livros.db'))
+
+def latencia(funcao, argumentos):
+    inicio = time.perf_counter()
+    for argumento in argumentos:
+        funcao(argumento)
+    return (time.perf_counter() - inicio) / len(argumentos) * 1000
+
+if __name__ == '__main__':
+    tamanhos = [int(valor) for valor in sys.argv[1:]] or [10_000, 100_000, 1_000_000]
+
+    print(f'{"livros":>9} {"armazenamento":>13} {"leitura ms":>11} {"escrita ms":>11} {"filtro ms":>10}')
+    for total in tamanhos:
+        livros = gera_livros(total)
+        ids = random.Random(2).sample(range(1, total + 1), min(total, 1000))
+        novos = [{**livro, 'id': total + i + 1} for i, livro in enumerate(livros[:100])]
+        for tipo in ('xml', 'sqlite'):
+            with tempfile.TemporaryDirectory() as pasta:
+                repositorio = abre(tipo, pasta)
+                repositorio.adiciona_lote(livros)
+                leitura = latencia(repositorio.obtem, ids)
+                escrita = latencia(repositorio.adiciona, novos)
+                filtro = latencia(repositorio.do_autor, AUTORES)
+                repositorio.fecha()
+            print(f'{total:>9} {tipo:>13} {leitura:>11.4f} {escrita:>11.4f} {filtro:>10.2f}')
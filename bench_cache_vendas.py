@@ -0,0 +1,26 @@
+import shutil
+import sys
+import time
+from relatorio_vendas import PASTA_CACHE, carrega_vendas, le_csv_cache
+
+def cronometra(funcao, *args, **kwargs):
+    inicio = time.perf_counter()
+    funcao(*args, **kwargs)
+    return time.perf_counter() - inicio
+
+if __name__ == '__main__':
+    arquivos = sys.argv[1:] or ['vendas.csv', 'vendas_data.csv']
+    colunas = ['Produto', 'Quantidade', 'Preco_Unitario']
+
+    for arquivo in arquivos:
+        shutil.rmtree(PASTA_CACHE, ignore_errors=True)
+        sem_cache = cronometra(carrega_vendas, arquivo)
+        frio = cronometra(carrega_vendas, arquivo, cache=True)
+        quente = cronometra(carrega_vendas, arquivo, cache=True)
+        colunas_quente = cronometra(le_csv_cache, arquivo, colunas=colunas)
+
+        print(arquivo)
+        print(f'  CSV:                {sem_cache:.4f}s')
+        print(f'  Cache frio:         {frio:.4f}s')
+        print(f'  Cache quente:       {quente:.4f}s')
+        print(f'  Quente, 3 colunas:  {colunas_quente:.4f}s')
@@ -0,0 +1,49 @@
+import os
+import shutil
+import sys
+import tempfile
+import time
+from contador_textos import conta_pasta
+
+# Versão antiga do Atvd 2.py (laço por linha, palavra e letra), mantida só para comparação
+def conta_serial(pasta):
+    resultados = []
+    for entrada in sorted(os.scandir(pasta), key=lambda e: e.name):
+        with open(entrada.path, 'r', encoding='utf-8') as file:
+            countWords = 0
+            countLetters = 0
+            for line in file:
+                if not line.isspace():
+                    for word in line.split():
+                        countWords += 1
+                        for letters in word:
+                            countLetters += 1
+        resultados.append((entrada.name, countWords, countLetters))
+    return resultados
+
+def replica_corpus(origem, destino, vezes):
+    for i in range(vezes):
+        for entrada in os.scandir(origem):
+            shutil.copyfile(entrada.path, os.path.join(destino, f'{i:05d}_{entrada.name}'))
+
+def cronometra(funcao, *args):
+    inicio = time.perf_counter()
+    resultado = funcao(*args)
+    return time.perf_counter() - inicio, resultado
+
+if __name__ == '__main__':
+    vezes = int(sys.argv[1]) if len(sys.argv) > 1 else 1000
+    with tempfile.TemporaryDirectory() as pasta:
+        replica_corpus('./Textos', pasta, vezes)
+
+        t_serial, serial = cronometra(conta_serial, pasta)
+        t_bytes, em_bytes = cronometra(conta_pasta, pasta, 1)
+        t_pool, pool = cronometra(conta_pasta, pasta)
+        t_mmap, em_mmap = cronometra(conta_pasta, pasta, 1, True)
+        assert serial == em_bytes == pool == em_mmap
+
+        print(f'Arquivos: {len(serial)}')
+        print(f'Laço serial:        {t_serial:.3f}s')
+        print(f'Bytes, 1 processo:  {t_bytes:.3f}s ({t_serial / t_bytes:.1f}x)')
+        print(f'Bytes, {os.cpu_count()} processos: {t_pool:.3f}s ({t_serial / t_pool:.1f}x)')
+        print(f'Mmap, 1 processo:   {t_mmap:.3f}s ({t_serial / t_mmap:.1f}x)')
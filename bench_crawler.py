@@ -0,0 +1,56 @@
+import asyncio
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from crawler import crawl
+
+LINKS_POR_PAGINA = 10
+
+class SiteSintetico(BaseHTTPRequestHandler):
+    # Site local e determinístico: /p/<n> aponta para as páginas n*10+1 ... n*10+10
+    total_paginas = 1000
+
+    def do_GET(self):
+        try:
+            numero = int(self.path.rsplit('/', 1)[-1] or 0)
+        except ValueError:
+            numero = -1
+        if not 0 <= numero < self.total_paginas:
+            self.send_error(404)
+            return
+
+        filhos = range(numero * LINKS_POR_PAGINA + 1, numero * LINKS_POR_PAGINA + LINKS_POR_PAGINA + 1)
+        links = ''.join(f'<a href="/p/{filho}">{filho}</a>' for filho in filhos if filho < self.total_paginas)
+        # Um href malformado por página: o crawler tem que ignorá-lo e seguir com os outros
+        corpo = f'<html><head><title>{numero}</title></head><body><a href="/p/0">início</a><a href="http://[foo/bar">x</a>{links}</body></html>'.encode('utf-8')
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/html; charset=utf-8')
+        self.send_header('Content-Length', str(len(corpo)))
+        self.end_headers()
+        self.wfile.write(corpo)
+
+    def log_message(self, *args):
+        pass
+
+def sobe_servidor(total_paginas):
+    SiteSintetico.total_paginas = total_paginas
+    servidor = ThreadingHTTPServer(('127.0.0.1', 0), SiteSintetico)
+    servidor.daemon_threads = True
+    threading.Thread(target=servidor.serve_forever, daemon=True).start()
+    return servidor
+
+if __name__ == '__main__':
+    total_paginas = int(sys.argv[1]) if len(sys.argv) > 1 else 1000
+    servidor = sobe_servidor(total_paginas)
+    url = f'http://127.0.0.1:{servidor.server_address[1]}/p/0'
+
+    try:
+        inicio = time.perf_counter()
+        paginas = asyncio.run(crawl(url, profundidade_max=10, concorrencia=32, por_host=32))
+        duracao = time.perf_counter() - inicio
+    finally:
+        servidor.shutdown()
+
+    assert len(paginas) == total_paginas, (len(paginas), total_paginas)
+    print(f'Páginas: {len(paginas)} em {duracao:.2f}s ({len(paginas) / duracao:.0f} páginas/s)')
@@ -0,0 +1,69 @@
+import os
+import random
+import sys
+import tempfile
+import time
+import xml.etree.ElementTree as ET
+from repositorio_livros import RepositorioLivros
+
+AUTORES = ['George Orwell', 'Jane Austen', 'Herman Melville', 'Aldous Huxley', 'Emily Brontë']
+GENEROS = ['Distopia', 'Romance', 'Aventura', 'Sátira', 'Realismo Mágico']
+
+def gera_livros(total, seed=0):
+    rng = random.Random(seed)
+    return [{
+        'id': id,
+        'titulo': f'Livro {id}',
+        'autor': rng.choice(AUTORES),
+        'ano': rng.randint(1500, 2024),
+        'genero': rng.choice(GENEROS)
+    } for id in range(1, total + 1)]
+
+def gera_xml(arquivo, total):
+    with open(arquivo, 'w', encoding='utf-8') as saida:
+        saida.write('<livros>\n')
+        for livro in gera_livros(total):
+            saida.write(f'<livro id="{livro["id"]}"><titulo>{livro["titulo"]}</titulo><autor>{livro["autor"]}</autor>'
+                        f'<ano>{livro["ano"]}</ano><genero>{livro["genero"]}</genero></livro>\n')
+        saida.write('</livros>')
+
+# Como cada handler do Atvd 4.py fazia antes: parse do arquivo inteiro e busca linear
+def busca_por_requisicao(arquivo, id):
+    tree = ET.parse(arquivo)
+    for livro in tree.findall('livro'):
+        if int(livro.attrib['id']) == id:
+            return livro
+    return None
+
+def latencia(funcao, ids):
+    inicio = time.perf_counter()
+    for id in ids:
+        funcao(id)
+    return (time.perf_counter() - inicio) / len(ids) * 1000
+
+if __name__ == '__main__':
+    total = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    with tempfile.TemporaryDirectory() as pasta:
+        arquivo = os.path.join(pasta, 'livros.xml')
+        gera_xml(arquivo, total)
+        ids = random.Random(1).sample(range(1, total + 1), 20)
+
+        antigo = latencia(lambda id: busca_por_requisicao(arquivo, id), ids)
+        inicio = time.perf_counter()
+        repositorio = RepositorioLivros(arquivo)
+        carga = time.perf_counter() - inicio
+        novo = latencia(repositorio.obtem, ids * 1000)
+
+        print(f'Livros: {total}')
+        print(f'Parse por requisição: {antigo:10.3f} ms/req')
+        print(f'Repositório em memória: {novo:8.4f} ms/req (carga inicial {carga:.2f}s)')
+        repositorio.fecha()
+
+        # Importação em lote: valida ids num conjunto, uma gravação no journal e uma reescrita do XML
+        vazio = os.path.join(pasta, 'lote.xml')
+        gera_xml(vazio, 0)
+        repositorio = RepositorioLivros(vazio)
+        inicio = time.perf_counter()
+        repositorio.adiciona_lote(gera_livros(total))
+        repositorio.fecha()
+        print(f'Importação em lote de {total} livros: {time.perf_counter() - inicio:.2f}s')
@@ -0,0 +1,39 @@
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+from bench_relatorio_vendas import gera_vendas
+from relatorio_vendas import carrega_vendas, total_por_produto, total_por_mes, agrega_vendas_em_blocos
+
+def gera_csv(arquivo, linhas, bloco=1_000_000):
+    # Gera o arquivo aos poucos para o próprio gerador não estourar a memória
+    escritas = 0
+    while escritas < linhas:
+        n = min(bloco, linhas - escritas)
+        gera_vendas(n, seed=escritas).to_csv(arquivo, index=False, mode='w' if escritas == 0 else 'a', header=escritas == 0)
+        escritas += n
+
+def mede(funcao, *args, **kwargs):
+    tracemalloc.start()
+    inicio = time.perf_counter()
+    funcao(*args, **kwargs)
+    duracao = time.perf_counter() - inicio
+    _, pico = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return duracao, pico / 2**20
+
+def completo(arquivo):
+    vendas = carrega_vendas(arquivo)
+    return total_por_produto(vendas), total_por_mes(vendas)
+
+if __name__ == '__main__':
+    linhas = int(sys.argv[1]) if len(sys.argv) > 1 else 10_000_000
+    # O CSV gerado passa de centenas de MB: fica numa pasta temporária, fora do repositório
+    with tempfile.TemporaryDirectory() as pasta:
+        arquivo = os.path.join(pasta, 'vendas_bench.csv')
+        gera_csv(arquivo, linhas)
+
+        for nome, funcao in [('Completo', completo), ('Em blocos', agrega_vendas_em_blocos)]:
+            duracao, pico = mede(funcao, arquivo)
+            print(f'{nome:10} {duracao:8.2f}s  pico: {pico:8.1f} MiB')
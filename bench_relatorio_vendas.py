@@ -0,0 +1,53 @@
+import sys
+import time
+import numpy as np
+import pandas as pd
+from relatorio_vendas import prepara_vendas, vendas_do_mes, total_por_produto
+
+def gera_vendas(linhas, seed=0):
+    rng = np.random.default_rng(seed)
+    datas = pd.Timestamp('2022-01-01') + pd.to_timedelta(rng.integers(0, 730, linhas), unit='D')
+    return pd.DataFrame({
+        'Data': datas.strftime('%d/%m/%Y'),
+        'Produto': rng.choice(['Produto A', 'Produto B', 'Produto C', 'Produto D'], linhas),
+        'Quantidade': rng.integers(1, 20, linhas),
+        'Preco_Unitario': rng.integers(1000, 10000, linhas) / 100,
+    })
+
+# Versão antiga do Atvd 1.py, mantida só para comparação
+def versao_laco(arq_csv):
+    arq_csv = arq_csv.copy()
+    arq_csv['Total_Venda'] = 0.0
+    arq_csv = arq_csv.sort_values(by='Produto')
+    total_vendas = []
+    vendas_janeiro = []
+    for prod in arq_csv.values:
+        prod[4] = prod[2] * prod[3]
+        total_vendas.append(prod)
+    for prod in arq_csv.values:
+        d, m, a = prod[0].split('/')
+        if m == '01' and a == '2023':
+            prod[4] = prod[2] * prod[3]
+            vendas_janeiro.append(prod)
+    return total_vendas, vendas_janeiro
+
+def versao_vetorizada(arq_csv):
+    vendas = prepara_vendas(arq_csv.copy())
+    return total_por_produto(vendas), vendas_do_mes(vendas, 1, 2023)
+
+def cronometra(funcao, *args):
+    inicio = time.perf_counter()
+    resultado = funcao(*args)
+    return time.perf_counter() - inicio, resultado
+
+if __name__ == '__main__':
+    linhas = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    vendas = gera_vendas(linhas)
+
+    t_laco, (_, janeiro_laco) = cronometra(versao_laco, vendas)
+    t_vet, (_, janeiro_vet) = cronometra(versao_vetorizada, vendas)
+    assert len(janeiro_laco) == len(janeiro_vet)
+
+    print(f'Linhas: {linhas}')
+    print(f'Laço:       {t_laco:.3f}s')
+    print(f'Vetorizado: {t_vet:.3f}s ({t_laco / t_vet:.1f}x)')
@@ -0,0 +1,101 @@
+import json
+import logging
+import os
+import random
+import sys
+import time
+import yaml
+from validador_json import compila_formato, em_lotes, novo_relatorio, valida_lote, valida_paralelo
+
+def gera_capitais(arquivo, total, seed=0):
+    # Cerca de 1% dos registros vem com algum campo do tipo errado
+    rng = random.Random(seed)
+    with open(arquivo, 'w', encoding='utf-8') as saida:
+        saida.write('{"capitais": [')
+        for i in range(total):
+            cidade = {
+                'nome': f'Cidade {i}',
+                'temperatura_media': round(rng.uniform(10, 35), 1),
+                'precipitacao_media': round(rng.uniform(500, 3000), 1),
+                'umidade_relativa': rng.randint(40, 95),
+                'vento_medio': round(rng.uniform(1, 20), 1)
+            }
+            if rng.random() < 0.01:
+                cidade[rng.choice(list(cidade))] = str(cidade['umidade_relativa'])
+            saida.write((',' if i else '') + json.dumps(cidade, ensure_ascii=False))
+        saida.write(']}')
+
+# Laço antigo do Atvd 5.py (sem o logging), mantido só para comparação
+def valida_antigo(capitais, config):
+    invalidos = 0
+    for cidade in capitais:
+        warming = False
+        for chave, valor in cidade.items():
+            yaml_json_format_type = config['formatter_json'][f'{chave}']
+            yaml_json_format_type = 'str' if yaml_json_format_type == 'string' else yaml_json_format_type
+            if yaml_json_format_type != type(valor).__name__:
+                warming = True
+        invalidos += warming
+    return invalidos
+
+def valida_compilado(capitais, config):
+    tipos = compila_formato(config['formatter_json'])
+    relatorio = novo_relatorio()
+    for lote in em_lotes(capitais):
+        valida_lote(lote, tipos, relatorio)
+    return relatorio['invalidos']
+
+def cronometra(funcao, *args):
+    inicio = time.perf_counter()
+    resultado = funcao(*args)
+    return time.perf_counter() - inicio, resultado
+
+if __name__ == '__main__':
+    total = int(sys.argv[1]) if len(sys.argv) > 1 else 5_000_000
+    arquivo = sys.argv[2] if len(sys.argv) > 2 else 'data_yaml.json'
+    with open('config.yaml', 'r') as file:
+        config = yaml.safe_load(file)
+    if not os.path.exists(arquivo):
+        gera_capitais(arquivo, total)
+
+    with open(arquivo, 'r', encoding='utf-8') as entrada:
+        capitais = json.load(entrada)['capitais']
+
+    t_antigo, invalidos_antigo = cronometra(valida_antigo, capitais, config)
+    t_novo, invalidos_novo = cronometra(valida_compilado, capitais, config)
+    assert invalidos_antigo == invalidos_novo
+
+    print(f'Registros: {len(capitais)} (inválidos: {invalidos_novo})')
+    print(f'Laço antigo: {t_antigo:.2f}s')
+    print(f'Compilado:   {t_novo:.2f}s ({t_antigo / t_novo:.1f}x)')
+
+    # Escalonamento por núcleos sobre a mesma massa em JSON Lines (shards por faixa de bytes)
+    arquivo_jsonl = os.path.splitext(arquivo)[0] + '.jsonl'
+    if not os.path.exists(arquivo_jsonl):
+        with open(arquivo_jsonl, 'w', encoding='utf-8') as saida:
+            saida.writelines(json.dumps(cidade, ensure_ascii=False) + '\n' for cidade in capitais)
+    del capitais
+
+    silencioso = logging.getLogger('bench_validador')
+    silencioso.propagate = False
+    silencioso.addHandler(logging.NullHandler())
+    silencioso.setLevel(logging.WARNING)
+    tipos = compila_formato(config['formatter_json'])
+    processos = 1
+    base = None
+    while processos <= (os.cpu_count() or 1):
+        duracao, _ = cronometra(valida_paralelo, arquivo_jsonl, tipos, silencioso, processos)
+        base = base or duracao
+        print(f'{processos:3} processo(s): {duracao:.2f}s ({base / duracao:.1f}x)')
+        processos *= 2
+
+    # O array original com o log em INFO: cada processo decodifica a própria faixa de bytes e devolve só o
+    # texto dos registros para o log
+    silencioso.setLevel(logging.INFO)
+    processos = 1
+    base = None
+    while processos <= (os.cpu_count() or 1):
+        duracao, _ = cronometra(valida_paralelo, arquivo, tipos, silencioso, processos)
+        base = base or duracao
+        print(f'{processos:3} processo(s), array em INFO: {duracao:.2f}s ({base / duracao:.1f}x)')
+        processos *= 2
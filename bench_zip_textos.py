@@ -0,0 +1,23 @@
+import os
+import sys
+import tempfile
+import time
+from bench_contador_textos import replica_corpus
+from contador_textos import COMPRESSOES, conta_pasta, lista_arquivos, zipa_resultado
+
+if __name__ == '__main__':
+    vezes = int(sys.argv[1]) if len(sys.argv) > 1 else 1000
+    with tempfile.TemporaryDirectory() as corpus, tempfile.TemporaryDirectory() as pasta:
+        replica_corpus('./Textos', corpus, vezes)
+        resultados = conta_pasta(corpus)
+        textos = lista_arquivos(corpus)
+        tamanho_origem = sum(os.path.getsize(caminho) for caminho in textos)
+
+        for compressao in COMPRESSOES:
+            destino = os.path.join(pasta, f'{compressao}.zip')
+            inicio = time.perf_counter()
+            zipa_resultado(resultados, destino, compressao=compressao, textos=textos, zip64=True)
+            duracao = time.perf_counter() - inicio
+            tamanho = os.path.getsize(destino)
+            print(f'{compressao:8} {tamanho_origem / duracao / 2**20:8.1f} MiB/s  '
+                  f'tamanho: {tamanho / 2**20:8.2f} MiB ({tamanho / tamanho_origem:.0%})')
@@ -0,0 +1,201 @@
+import codecs
+import hashlib
+import json
+import mmap
+import os
+import re
+import zipfile
+from concurrent.futures import ProcessPoolExecutor
+from itertools import chain, repeat
+
+# Bytes de continuação do UTF-8 (10xxxxxx): não iniciam um caractere novo
+BYTES_CONTINUACAO = bytes(range(0x80, 0xC0))
+# Separadores do str.split() que o bytes.split() não conhece: \x1c-\x1f e os espaços Unicode (NBSP, U+2000-U+200A,
+# U+3000...) em UTF-8. Em UTF-8 válido essas sequências só aparecem como esses caracteres
+ESPACOS_FORA_BYTES = re.compile(rb'[\x1c-\x1f]|\xc2[\x85\xa0]|\xe1\x9a\x80|\xe2\x80[\x80-\x8a\xa8\xa9\xaf]|\xe2\x81\x9f|\xe3\x80\x80')
+# Sobe quando as regras de contagem mudam, para o manifesto não reaproveitar contagens antigas
+REGRAS_CONTAGEM = 2
+TAMANHO_BLOCO = 16 * 2**20
+COMPRESSOES = {
+    'stored': zipfile.ZIP_STORED,
+    'deflate': zipfile.ZIP_DEFLATED,
+    'bzip2': zipfile.ZIP_BZIP2,
+    'lzma': zipfile.ZIP_LZMA,
+}
+
+def conta_bytes(dados):
+    # Palavras separadas por espaço em branco; letras = caracteres UTF-8 fora dos espaços.
+    # As regras são as do conta_blocos (texto decodificado, como o laço original do Atvd 2.py): o atalho em bytes
+    # só vale para UTF-8 válido sem separadores fora do ASCII; o resto é contado sobre o texto decodificado
+    if not dados.isascii():
+        try:
+            dados.decode('utf-8')
+        except UnicodeDecodeError:
+            return conta_blocos([dados])
+    if ESPACOS_FORA_BYTES.search(dados):
+        return conta_blocos([dados])
+    palavras = dados.split()
+    sem_espacos = b''.join(palavras)
+    return len(palavras), len(sem_espacos.translate(None, BYTES_CONTINUACAO))
+
+def conta_arquivo(caminho):
+    with open(caminho, 'rb') as arquivo:
+        palavras, letras = conta_bytes(arquivo.read())
+    return os.path.basename(caminho), palavras, letras
+
+def blocos_arquivo(caminho, tamanho_bloco=TAMANHO_BLOCO):
+    # Blocos do arquivo mapeado em memória, então o consumo não depende do tamanho do arquivo
+    with open(caminho, 'rb') as arquivo:
+        tamanho = os.fstat(arquivo.fileno()).st_size
+        if tamanho == 0:
+            return
+
+        with mmap.mmap(arquivo.fileno(), 0, access=mmap.ACCESS_READ) as mapa:
+            for inicio in range(0, tamanho, tamanho_bloco):
+                yield mapa[inicio:inicio + tamanho_bloco]
+
+def conta_blocos(blocos, encoding='utf-8'):
+    # O decodificador incremental segura sequências multibyte cortadas no fim do bloco e, com errors='replace',
+    # cada byte inválido (ex.: acento em latin-1) vira um único caractere, mantendo a contagem de letras.
+    decodificador = codecs.getincrementaldecoder(encoding)(errors='replace')
+    palavras = letras = 0
+    # Só o fato de o bloco anterior ter terminado no meio de uma palavra passa para o próximo, não o texto dela:
+    # uma sequência enorme sem espaços (minificado, binário) não acumula memória nem é redividida a cada bloco
+    em_palavra = False
+
+    for bloco in chain(blocos, [None]):
+        texto = decodificador.decode(b'', final=True) if bloco is None else decodificador.decode(bloco)
+        if not texto:
+            continue
+        partes = texto.split()
+        palavras += len(partes)
+        letras += sum(map(len, partes))
+        if em_palavra and partes and not texto[0].isspace():
+            # O primeiro pedaço continua a palavra que já foi contada no bloco anterior
+            palavras -= 1
+        em_palavra = not texto[-1].isspace()
+
+    return palavras, letras
+
+def conta_arquivo_mmap(caminho, tamanho_bloco=TAMANHO_BLOCO, encoding='utf-8'):
+    palavras, letras = conta_blocos(blocos_arquivo(caminho, tamanho_bloco), encoding)
+    return os.path.basename(caminho), palavras, letras
+
+def novo_hash():
+    return hashlib.blake2b(digest_size=16)
+
+def _atualiza_hash(blocos, hash_conteudo):
+    for bloco in blocos:
+        hash_conteudo.update(bloco)
+        yield bloco
+
+def conta_arquivo_com_hash(caminho, hash_anterior=None, usar_mmap=True, tamanho_bloco=TAMANHO_BLOCO):
+    # Hash e contagem no mesmo passe pelos blocos do mmap (ou pelo arquivo inteiro em memória, sem usar_mmap).
+    # Com hash_anterior (arquivo do mesmo tamanho que só teve o mtime alterado) calcula antes só o hash, bem mais
+    # barato que contar, e se o conteúdo for o mesmo devolve None no lugar das contagens
+    if hash_anterior is not None:
+        hash_conteudo = novo_hash()
+        for bloco in blocos_arquivo(caminho, tamanho_bloco):
+            hash_conteudo.update(bloco)
+        if hash_conteudo.hexdigest() == hash_anterior:
+            return hash_anterior, None, None
+
+    hash_conteudo = novo_hash()
+    if usar_mmap:
+        palavras, letras = conta_blocos(_atualiza_hash(blocos_arquivo(caminho, tamanho_bloco), hash_conteudo))
+    else:
+        with open(caminho, 'rb') as arquivo:
+            dados = arquivo.read()
+        hash_conteudo.update(dados)
+        palavras, letras = conta_bytes(dados)
+    return hash_conteudo.hexdigest(), palavras, letras
+
+def lista_arquivos(pasta):
+    return sorted(entrada.path for entrada in os.scandir(pasta) if entrada.is_file())
+
+def conta_pasta(pasta, processos=None, usar_mmap=False):
+    arquivos = lista_arquivos(pasta)
+    conta = conta_arquivo_mmap if usar_mmap else conta_arquivo
+    return _executa(conta, arquivos, processos)
+
+def _executa(conta, arquivos, processos, *argumentos):
+    # argumentos: listas paralelas a arquivos com os demais parâmetros de conta
+    if processos == 1 or len(arquivos) <= 1:
+        return [conta(*parametros) for parametros in zip(arquivos, *argumentos)]
+
+    # map devolve na ordem de entrada, então o resultado sai estável independente de qual processo termina antes
+    lote = max(1, len(arquivos) // ((processos or os.cpu_count() or 1) * 4))
+    with ProcessPoolExecutor(max_workers=processos) as pool:
+        return list(pool.map(conta, arquivos, *argumentos, chunksize=lote))
+
+def carrega_manifesto(manifesto):
+    try:
+        with open(manifesto, 'r', encoding='utf-8') as arquivo:
+            return json.load(arquivo)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return {}
+
+def salva_manifesto(registros, manifesto):
+    # Grava num temporário e troca de uma vez para nunca deixar um manifesto pela metade
+    temporario = manifesto + '.tmp'
+    with open(temporario, 'w', encoding='utf-8') as arquivo:
+        json.dump(registros, arquivo)
+    os.replace(temporario, manifesto)
+
+def conta_pasta_incremental(pasta, manifesto='resultado.manifesto.json', processos=None, usar_mmap=False):
+    # Só reconta arquivos novos ou cujo tamanho/mtime mudou; os removidos somem do manifesto.
+    # Mesmo tamanho com outro mtime (arquivo só tocado ou copiado de novo) é conferido pelo hash antes de recontar.
+    # Os dois modos contam igual; usar_mmap só troca a leitura inteira em memória pela leitura em blocos
+    anteriores = carrega_manifesto(manifesto)
+    registros = {}
+    pendentes = []
+
+    for entrada in os.scandir(pasta):
+        if not entrada.is_file():
+            continue
+        info = entrada.stat()
+        registro = anteriores.get(entrada.path)
+        if registro and registro.get('regras') != REGRAS_CONTAGEM:
+            registro = None
+        if registro and registro['tamanho'] == info.st_size and registro['mtime'] == info.st_mtime_ns:
+            registros[entrada.path] = registro
+        else:
+            pendentes.append((entrada.path, info, registro if registro and registro['tamanho'] == info.st_size else None))
+
+    caminhos = [caminho for caminho, _, _ in pendentes]
+    hashes_anteriores = [registro and registro.get('hash') for _, _, registro in pendentes]
+    contagens = _executa(conta_arquivo_com_hash, caminhos, processos, hashes_anteriores, repeat(usar_mmap))
+    for (caminho, info, anterior), (hash_conteudo, palavras, letras) in zip(pendentes, contagens):
+        if palavras is None:
+            palavras, letras = anterior['palavras'], anterior['letras']
+        registros[caminho] = {
+            'tamanho': info.st_size,
+            'mtime': info.st_mtime_ns,
+            'hash': hash_conteudo,
+            'regras': REGRAS_CONTAGEM,
+            'palavras': palavras,
+            'letras': letras,
+        }
+
+    salva_manifesto(registros, manifesto)
+    return [(os.path.basename(caminho), registros[caminho]['palavras'], registros[caminho]['letras']) for caminho in sorted(registros)]
+
+def formata_linha(nome, palavras, letras):
+    return f'Arquivo: {nome} - Palavras: {palavras} - Letras: {letras} \n\n'
+
+def escreve_resultado(resultados, arquivo='resultado.txt'):
+    with open(arquivo, 'w', encoding='utf-8') as saida:
+        saida.writelines(formata_linha(*resultado) for resultado in resultados)
+
+def zipa_resultado(resultados, arquivo_zip='saida.zip', nome='resultado.txt', compressao='deflate', nivel=None, textos=None, zip64=False):
+    # Escreve o resultado direto na entrada do zip, sem passar por um arquivo temporário em disco.
+    # zip64=True permite entradas e arquivos acima de 4 GiB quando o tamanho final não é conhecido.
+    metodo = COMPRESSOES[compressao]
+    with zipfile.ZipFile(arquivo_zip, 'w', compression=metodo, compresslevel=nivel, allowZip64=True) as zipper:
+        with zipper.open(nome, 'w', force_zip64=zip64) as entrada:
+            for resultado in resultados:
+                entrada.write(formata_linha(*resultado).encode('utf-8'))
+
+        # Opcionalmente junta os textos de origem no mesmo arquivo
+        for caminho in textos or []:
+            zipper.write(caminho, arcname=os.path.join('Textos', os.path.basename(caminho)))
@@ -0,0 +1,86 @@
+import asyncio
+import logging
+from urllib.parse import urldefrag, urljoin, urlparse
+import aiohttp
+from lxml import etree, html
+
+log = logging.getLogger(__name__)
+
+def extrai_links(conteudo, url_base):
+    # Mesmo papel do doc.find_all('a') do Atvd 3.py, mas com o parser em C do lxml
+    try:
+        documento = html.fromstring(conteudo)
+    except (ValueError, etree.ParserError):
+        return []
+
+    links = []
+    for href in documento.xpath('//a/@href'):
+        try:
+            url, _ = urldefrag(urljoin(url_base, href.strip()))
+            esquema = urlparse(url).scheme
+        except ValueError:
+            # href malformado (ex.: 'http://[foo/bar', IPv6 sem o ']'): só ele é ignorado, não a página
+            continue
+        if esquema in ('http', 'https'):
+            links.append(url)
+    return links
+
+async def _baixa(sessao, url):
+    # Devolve também a URL final, depois dos redirecionamentos, que é a base dos links relativos
+    async with sessao.get(url) as resposta:
+        if resposta.status != 200 or 'html' not in resposta.headers.get('Content-Type', ''):
+            return None, None
+        return str(resposta.url), await resposta.read()
+
+async def crawl(url_inicial, profundidade_max=2, concorrencia=32, por_host=8, mesmo_host=True, timeout=10):
+    # Retorna {url: [links]} de todas as páginas visitadas até a profundidade máxima
+    host_inicial = urlparse(url_inicial).netloc
+    url_inicial, _ = urldefrag(url_inicial)
+    visitados = {url_inicial}
+    paginas = {}
+    fila = asyncio.Queue()
+    fila.put_nowait((url_inicial, 0))
+
+    # O conector mantém o pool de conexões e limita as conexões simultâneas por host
+    conector = aiohttp.TCPConnector(limit=concorrencia, limit_per_host=por_host)
+    async with aiohttp.ClientSession(connector=conector, timeout=aiohttp.ClientTimeout(total=timeout)) as sessao:
+
+        async def trabalhador():
+            while True:
+                url, profundidade = await fila.get()
+                try:
+                    url_final, conteudo = await _baixa(sessao, url)
+                    if conteudo is None:
+                        continue
+                    links = extrai_links(conteudo, url_final)
+                    paginas[url] = links
+                    if profundidade >= profundidade_max:
+                        continue
+                    for link in links:
+                        if link in visitados or (mesmo_host and urlparse(link).netloc != host_inicial):
+                            continue
+                        visitados.add(link)
+                        fila.put_nowait((link, profundidade + 1))
+                except (aiohttp.ClientError, asyncio.TimeoutError):
+                    pass
+                except Exception:
+                    # Uma página com problema não pode derrubar o trabalhador: sem ele a fila nunca esvazia
+                    log.exception('Falha ao processar %s', url)
+                finally:
+                    fila.task_done()
+
+        trabalhadores = [asyncio.create_task(trabalhador()) for _ in range(concorrencia)]
+        await fila.join()
+        for tarefa in trabalhadores:
+            tarefa.cancel()
+        await asyncio.gather(*trabalhadores, return_exceptions=True)
+
+    return paginas
+
+if __name__ == '__main__':
+    import sys
+    resultado = asyncio.run(crawl(sys.argv[1], profundidade_max=int(sys.argv[2]) if len(sys.argv) > 2 else 1))
+    for pagina, links in resultado.items():
+        print(pagina)
+        for link in links:
+            print('   ', link)
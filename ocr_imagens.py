@@ -0,0 +1,93 @@
+import hashlib
+import json
+import os
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from PIL import Image, ImageOps
+import pytesseract as pyt
+
+EXTENSOES = ('.png', '.jpg', '.jpeg', '.bmp', '.tif', '.tiff', '.gif', '.webp')
+LADO_MAXIMO = 2000
+LIMIAR = 160
+
+def hash_arquivo(caminho):
+    sha = hashlib.sha256()
+    with open(caminho, 'rb') as arquivo:
+        for bloco in iter(lambda: arquivo.read(2**20), b''):
+            sha.update(bloco)
+    return sha.hexdigest()
+
+def prepara_imagem(imagem, lado_maximo=LADO_MAXIMO, limiar=LIMIAR):
+    # Tons de cinza, reduz imagens muito grandes e binariza: menos pixels para o tesseract processar
+    imagem = ImageOps.grayscale(imagem)
+    imagem.thumbnail((lado_maximo, lado_maximo))
+    return imagem.point(lambda p: 255 if p > limiar else 0, mode='1')
+
+def _ocr(tarefa):
+    caminho, hash_imagem, tesseract_cmd = tarefa
+    if tesseract_cmd:
+        pyt.pytesseract.tesseract_cmd = tesseract_cmd
+    try:
+        with Image.open(caminho) as imagem:
+            texto = pyt.image_to_string(prepara_imagem(imagem))
+    except Exception as e:
+        return {'arquivo': caminho, 'hash': hash_imagem, 'erro': str(e)}
+    return {'arquivo': caminho, 'hash': hash_imagem, 'texto': texto}
+
+def lista_imagens(pasta):
+    return sorted(entrada.path for entrada in os.scandir(pasta) if entrada.is_file() and entrada.name.lower().endswith(EXTENSOES))
+
+def hashes_processados(arquivo_resultado):
+    if not os.path.exists(arquivo_resultado):
+        return set()
+    hashes = set()
+    with open(arquivo_resultado, 'r', encoding='utf-8') as arquivo:
+        for linha in arquivo:
+            try:
+                registro = json.loads(linha)
+            except json.JSONDecodeError:
+                continue
+            if 'texto' in registro:
+                hashes.add(registro['hash'])
+    return hashes
+
+def _tarefas(imagens, vistos, tesseract_cmd):
+    # Hash calculado só quando a tarefa vai ser enviada: o pai lê a próxima imagem enquanto os processos fazem OCR
+    for caminho in imagens:
+        hash_imagem = hash_arquivo(caminho)
+        if hash_imagem not in vistos:
+            vistos.add(hash_imagem)
+            yield caminho, hash_imagem, tesseract_cmd
+
+def _mapa_limitado(pool, funcao, tarefas, janela):
+    # Como pool.map, mas só mantém 'janela' imagens em andamento: Executor.map consome o iterável inteiro
+    # (e faria o hash de todas as imagens) antes de devolver o primeiro resultado
+    pendentes = deque()
+    for tarefa in tarefas:
+        pendentes.append(pool.submit(funcao, tarefa))
+        if len(pendentes) >= janela:
+            yield pendentes.popleft().result()
+    while pendentes:
+        yield pendentes.popleft().result()
+
+def processa_imagens(imagens, arquivo_resultado='textoImg.jsonl', processos=None, tesseract_cmd=None):
+    # imagens pode ser uma pasta ou qualquer iterável de caminhos; imagens já reconhecidas (mesmo hash) são puladas.
+    # Os resultados saem na ordem de entrada
+    if isinstance(imagens, str):
+        imagens = lista_imagens(imagens)
+
+    processos = processos or os.cpu_count() or 1
+    tarefas = _tarefas(imagens, hashes_processados(arquivo_resultado), tesseract_cmd)
+
+    processados = 0
+    with ProcessPoolExecutor(max_workers=processos) as pool, \
+            open(arquivo_resultado, 'a', encoding='utf-8') as saida:
+        for registro in _mapa_limitado(pool, _ocr, tarefas, 2 * processos):
+            saida.write(json.dumps(registro, ensure_ascii=False) + '\n')
+            processados += 1
+    return processados
+
+if __name__ == '__main__':
+    import sys
+    total = processa_imagens(sys.argv[1], *sys.argv[2:3])
+    print(f'Imagens processadas: {total}')
@@ -0,0 +1,147 @@
+import hashlib
+import os
+import re
+import pandas as pd
+
+COLUNAS = ['Data', 'Produto', 'Quantidade', 'Preco_Unitario', 'Total_Venda']
+# Colunas do CSV que o prepara_vendas usa; o Total_Venda é recalculado
+COLUNAS_ENTRADA = ['Data', 'Produto', 'Quantidade', 'Preco_Unitario']
+FORMATO_DATA = '%d/%m/%Y'
+TIPOS_COLUNAS = {'Data': 'string', 'Produto': 'category', 'Quantidade': 'int32', 'Preco_Unitario': 'float32'}
+TAMANHO_BLOCO = 1_000_000
+PASTA_CACHE = '.cache_vendas'
+# O Excel recusa esses caracteres no nome da aba e limita o nome a 31 caracteres
+CARACTERES_INVALIDOS_ABA = re.compile(r'[\[\]:*?/\\]')
+TAMANHO_NOME_ABA = 31
+
+def carrega_vendas(arquivo, cache=False):
+    vendas = le_csv_cache(arquivo, colunas=COLUNAS_ENTRADA) if cache else pd.read_csv(arquivo)
+    return prepara_vendas(vendas)
+
+def prefixo_cache(arquivo):
+    # Igual para todas as versões do mesmo CSV, para achar e apagar as entradas antigas
+    return hashlib.sha1(os.path.abspath(arquivo).encode('utf-8')).hexdigest()[:16]
+
+def caminho_cache(arquivo, pasta_cache=PASTA_CACHE):
+    # A chave muda sempre que o CSV for alterado (caminho, mtime e tamanho)
+    info = os.stat(arquivo)
+    chave = f'{os.path.abspath(arquivo)}|{info.st_mtime_ns}|{info.st_size}'
+    nome = hashlib.sha1(chave.encode('utf-8')).hexdigest()
+    return os.path.join(pasta_cache, f'{prefixo_cache(arquivo)}-{nome}.arrow')
+
+def remove_caches_antigos(arquivo, atual, pasta_cache=PASTA_CACHE):
+    # Cada alteração do CSV gera uma entrada nova; as das versões anteriores não seriam lidas nunca mais
+    prefixo = prefixo_cache(arquivo) + '-'
+    for entrada in os.scandir(pasta_cache):
+        if entrada.name.startswith(prefixo) and entrada.name.endswith('.arrow') and entrada.path != atual:
+            try:
+                os.remove(entrada.path)
+            except OSError:
+                # Outro processo pode ter apagado antes, ou ainda estar com ela mapeada (Windows)
+                pass
+
+def le_csv_cache(arquivo, colunas=None, pasta_cache=PASTA_CACHE):
+    # Na primeira leitura converte o CSV para Arrow (sem compressão, para permitir mmap);
+    # nas seguintes mapeia o arquivo em memória e lê só as colunas pedidas
+    import pyarrow.csv as pa_csv
+    import pyarrow.feather as feather
+
+    destino = caminho_cache(arquivo, pasta_cache)
+    if not os.path.exists(destino):
+        os.makedirs(pasta_cache, exist_ok=True)
+        tabela = pa_csv.read_csv(arquivo, convert_options=pa_csv.ConvertOptions(strings_can_be_null=False))
+        temporario = destino + '.tmp'
+        feather.write_feather(tabela, temporario, compression='uncompressed')
+        os.replace(temporario, destino)
+        remove_caches_antigos(arquivo, destino, pasta_cache)
+
+    tabela = feather.read_table(destino, columns=colunas, memory_map=True)
+    return tabela.to_pandas()
+
+def prepara_vendas(vendas):
+    # Total calculado de uma vez sobre as colunas, sem laço por linha
+    vendas['Total_Venda'] = vendas['Quantidade'] * vendas['Preco_Unitario']
+    # A data é convertida uma única vez com o formato explícito
+    vendas['Data_Venda'] = pd.to_datetime(vendas['Data'], format=FORMATO_DATA)
+    return vendas.sort_values(by='Produto')
+
+def vendas_do_mes(vendas, mes, ano):
+    datas = vendas['Data_Venda']
+    mascara = (datas.dt.month == mes) & (datas.dt.year == ano)
+    return vendas.loc[mascara, COLUNAS]
+
+def total_por_produto(vendas):
+    return vendas.groupby('Produto', sort=True, observed=True)['Total_Venda'].sum()
+
+def total_por_mes(vendas):
+    return vendas.groupby(vendas['Data_Venda'].dt.to_period('M'), sort=True)['Total_Venda'].sum()
+
+def le_vendas_em_blocos(arquivo, tamanho_bloco=TAMANHO_BLOCO):
+    # Lê o CSV em blocos de tamanho fixo com tipos compactos; nunca há mais de um bloco na memória
+    for bloco in pd.read_csv(arquivo, dtype=TIPOS_COLUNAS, chunksize=tamanho_bloco):
+        bloco['Total_Venda'] = bloco['Quantidade'].astype('float64') * bloco['Preco_Unitario']
+        bloco['Data_Venda'] = pd.to_datetime(bloco['Data'], format=FORMATO_DATA)
+        yield bloco
+
+def agrega_vendas_em_blocos(arquivo, tamanho_bloco=TAMANHO_BLOCO, arquivo_mes=None, mes=1, ano=2023):
+    # Os agregados de cada bloco são somados aos acumulados, então o pico de memória depende só do tamanho do bloco
+    por_produto = pd.Series(dtype='float64')
+    por_mes = pd.Series(dtype='float64')
+    cabecalho = True
+
+    for bloco in le_vendas_em_blocos(arquivo, tamanho_bloco):
+        produtos = total_por_produto(bloco)
+        produtos.index = produtos.index.astype(str)
+        por_produto = por_produto.add(produtos, fill_value=0)
+        por_mes = por_mes.add(total_por_mes(bloco), fill_value=0)
+
+        if arquivo_mes is not None:
+            vendas_do_mes(bloco, mes, ano).to_csv(arquivo_mes, index=False, mode='w' if cabecalho else 'a', header=cabecalho)
+            cabecalho = False
+
+    por_produto.index.name = 'Produto'
+    por_mes.index.name = 'Mes'
+    return por_produto.sort_index(), por_mes.sort_index()
+
+def salva_vendas_mes(vendas, arquivo, mes=1, ano=2023):
+    vendas_do_mes(vendas, mes, ano).to_csv(arquivo, index=False)
+
+def salva_vendas_por_produto(vendas, arquivo, streaming=False):
+    # Um único writer aberto para todas as abas, em vez de reabrir o arquivo a cada produto
+    grupos = vendas[COLUNAS].groupby('Produto', sort=True, observed=True)
+    if streaming:
+        _salva_streaming(grupos, arquivo)
+        return
+
+    with pd.ExcelWriter(arquivo, engine='openpyxl', mode='w') as writer:
+        for nome, grupo in _abas(grupos):
+            grupo.to_excel(writer, sheet_name=nome, index=False)
+
+def _salva_streaming(grupos, arquivo):
+    # Modo write-only do openpyxl: as linhas vão direto para o disco e nenhuma aba fica inteira na memória
+    from openpyxl import Workbook
+
+    livro = Workbook(write_only=True)
+    for nome, grupo in _abas(grupos):
+        aba = livro.create_sheet(title=nome)
+        aba.append(COLUNAS)
+        for linha in grupo.itertuples(index=False, name=None):
+            aba.append(linha)
+    livro.save(arquivo)
+
+def _abas(grupos):
+    usados = set()
+    for produto, grupo in grupos:
+        yield _nome_aba(produto, usados), grupo
+
+def _nome_aba(produto, usados):
+    # Troca os caracteres proibidos, corta em 31 e, se dois produtos caírem no mesmo nome (o Excel não diferencia
+    # maiúsculas), acrescenta ' (2)', ' (3)'... em vez de juntar os dois na mesma aba
+    base = CARACTERES_INVALIDOS_ABA.sub('_', str(produto))[:TAMANHO_NOME_ABA].strip("'") or 'Produto'
+    nome, numero = base, 1
+    while nome.lower() in usados:
+        numero += 1
+        sufixo = f' ({numero})'
+        nome = base[:TAMANHO_NOME_ABA - len(sufixo)] + sufixo
+    usados.add(nome.lower())
+    return nome
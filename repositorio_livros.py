@@ -0,0 +1,622 @@
+import heapq
+import json
+import logging
+import os
+from bisect import bisect_left, bisect_right, insort
+import sqlite3
+import threading
+from abc import ABC, abstractmethod
+import xml.etree.ElementTree as ET
+from xml.sax.saxutils import escape, quoteattr
+
+log = logging.getLogger(__name__)
+
+def elemento_para_livro(elemento):
+    texto = lambda tag: elemento.findtext(tag)
+    ano = texto('ano')
+    return {
+        'id': int(elemento.get('id')),
+        'titulo': texto('titulo'),
+        'autor': texto('autor'),
+        'ano': int(ano) if ano else None,
+        'genero': texto('genero')
+    }
+
+def livro_para_xml(livro):
+    campos = ''.join(f'<{tag}>{escape(str(livro[tag]))}</{tag}>' for tag in ('titulo', 'autor', 'ano', 'genero') if livro[tag] is not None)
+    return f'<livro id={quoteattr(str(livro["id"]))}>{campos}</livro>\n'
+
+CAMPOS_ORDEM = ('id', 'titulo', 'autor', 'ano', 'genero')
+
+def valida_ordem(ordem):
+    # 'ano' ordena crescente, '-ano' decrescente
+    campo = (ordem or 'id').lstrip('-')
+    if campo not in CAMPOS_ORDEM:
+        raise ValueError(f'Ordem inválida. Use um de {list(CAMPOS_ORDEM)}, com "-" na frente para decrescente')
+    return campo, (ordem or '').startswith('-')
+
+def depois_do_cursor(livro, campo, reverso, apos):
+    # apos = (valor do campo, id) do último livro entregue. A ordem é: campo preenchido (crescente ou decrescente,
+    # empates por id crescente) e depois os livros sem o campo, por id
+    if apos is None:
+        return True
+    valor, id = apos
+    atual = livro[campo]
+    if atual is None:
+        return valor is not None or livro['id'] > id
+    if valor is None:
+        return False
+    if atual == valor:
+        return livro['id'] > id
+    return atual < valor if reverso else atual > valor
+
+def ordena_livros(livros, campo, reverso=False, apos=None, limite=None):
+    # Empates ficam por id crescente e livros sem o campo vão para o fim. Com limite só os primeiros da ordem
+    # são escolhidos (heapq), sem ordenar o resultado inteiro a cada página
+    livros = [livro for livro in livros if depois_do_cursor(livro, campo, reverso, apos)]
+    preenchidos = [livro for livro in livros if livro[campo] is not None]
+    vazios = [livro for livro in livros if livro[campo] is None]
+    if limite is None:
+        preenchidos.sort(key=lambda livro: livro['id'])
+        preenchidos.sort(key=lambda livro: livro[campo], reverse=reverso)
+        vazios.sort(key=lambda livro: livro['id'])
+        return preenchidos + vazios
+    # Decrescente com empate por id crescente é o maior (valor, -id)
+    if reverso:
+        preenchidos = heapq.nlargest(limite, preenchidos, key=lambda livro: (livro[campo], -livro['id']))
+    else:
+        preenchidos = heapq.nsmallest(limite, preenchidos, key=lambda livro: (livro[campo], livro['id']))
+    return preenchidos + heapq.nsmallest(limite - len(preenchidos), vazios, key=lambda livro: livro['id'])
+
+class ArmazenamentoLivros(ABC):
+    # Interface usada pelas rotas do Atvd 4.py. Livros são dicts com id, titulo, autor, ano e genero.
+    # adiciona/adiciona_lote/atualiza levantam ValueError para id em uso; atualiza/remove levantam KeyError para id inexistente.
+    # itera devolve os livros em ordem de id a partir do primeiro id maior que 'apos' (cursor por chave, não por posição).
+    # filtra recebe em 'apos' o par (valor do campo da ordem, id) do último livro da página anterior, também por chave:
+    # continua valendo se esse livro foi removido ou saiu do filtro.
+
+    TAMANHO_LOTE_LEITURA = 1000
+
+    @abstractmethod
+    def existe(self, id): ...
+
+    @abstractmethod
+    def obtem(self, id): ...
+
+    @abstractmethod
+    def todos(self): ...
+
+    @abstractmethod
+    def do_autor(self, autor): ...
+
+    @abstractmethod
+    def do_genero(self, genero): ...
+
+    @abstractmethod
+    def filtra(self, autor=None, genero=None, ano_min=None, ano_max=None, ordem='id', apos=None, limite=None): ...
+
+    @abstractmethod
+    def itera(self, apos=None, limite=None): ...
+
+    @abstractmethod
+    def adiciona(self, livro): ...
+
+    @abstractmethod
+    def adiciona_lote(self, livros): ...
+
+    @abstractmethod
+    def atualiza(self, id, livro): ...
+
+    @abstractmethod
+    def remove(self, id): ...
+
+    def fecha(self):
+        pass
+
+class RepositorioLivros(ArmazenamentoLivros):
+    # Carrega o livros.xml uma vez em um dict indexado por id, com índices secundários por autor e gênero.
+    # Antes de cada leitura confere mtime/tamanho do arquivo e recarrega se ele mudou por fora.
+    #
+    # Alterações vão primeiro para um journal append-only (uma linha JSON por operação, com fsync) e só depois,
+    # em lote, um compactador em segundo plano reescreve o XML inteiro via arquivo temporário + os.replace.
+    # As operações gravam o estado final do livro ('salva'/'remove'), então reaplicar o journal é idempotente.
+
+    def __init__(self, arquivo='livros.xml', journal=None, intervalo_compactacao=1.0, tamanho_lote=1000):
+        self.arquivo = arquivo
+        self.journal = journal or arquivo + '.journal'
+        self.intervalo_compactacao = intervalo_compactacao
+        self.tamanho_lote = tamanho_lote
+        self._trava = threading.RLock()
+        self._trava_compactacao = threading.Lock()
+        self._assinatura = None
+        self._pendentes = 0
+        self.livros = {}
+        self.por_autor = {}
+        self.por_genero = {}
+        self.por_ano = []
+        self.sem_ano = []
+        self.ids_ordenados = []
+        self.recarrega_se_alterado()
+
+        self._saida_journal = open(self.journal, 'a', encoding='utf-8')
+        if self._saida_journal.tell() > 0 and not self._termina_com_quebra(self.journal):
+            # Isola uma linha cortada por queda para a próxima operação não ser grudada nela
+            self._saida_journal.write('\n')
+        self._acorda = threading.Event()
+        self._parar = threading.Event()
+        self._compactador = threading.Thread(target=self._loop_compactacao, daemon=True)
+        self._compactador.start()
+
+    @staticmethod
+    def _termina_com_quebra(caminho):
+        with open(caminho, 'rb') as arquivo:
+            arquivo.seek(-1, os.SEEK_END)
+            return arquivo.read(1) == b'\n'
+
+    @property
+    def _journal_compactando(self):
+        return self.journal + '.compactando'
+
+    def _assinatura_arquivo(self):
+        info = os.stat(self.arquivo)
+        return info.st_mtime_ns, info.st_size
+
+    def recarrega_se_alterado(self):
+        assinatura = self._assinatura_arquivo()
+        if assinatura != self._assinatura:
+            with self._trava:
+                self._carrega()
+                self._assinatura = assinatura
+
+    def _carrega(self):
+        self._pendentes = 0
+        livros = {}
+        for _, elemento in ET.iterparse(self.arquivo):
+            if elemento.tag == 'livro':
+                livro = elemento_para_livro(elemento)
+                livros[livro['id']] = livro
+                elemento.clear()
+
+        self.livros = livros
+        self.por_autor = {}
+        self.por_genero = {}
+        for livro in livros.values():
+            self._indexa(livro, ordenados=False)
+        self._reconstroi_ordenados()
+
+        # Escritas já confirmadas que ainda não chegaram no XML
+        for journal in (self._journal_compactando, self.journal):
+            self._reaplica(journal)
+
+    def _reaplica(self, journal):
+        if not os.path.exists(journal):
+            return
+        with open(journal, 'r', encoding='utf-8') as entrada:
+            for linha in entrada:
+                try:
+                    operacao = json.loads(linha)
+                except json.JSONDecodeError:
+                    # Linha cortada por uma queda no meio da escrita: nunca foi confirmada
+                    continue
+                self._aplica(operacao)
+                self._pendentes += 1
+
+    def _aplica(self, operacao):
+        if operacao['op'] == 'salva':
+            for id in operacao.get('ids', ()):
+                self._remove_da_memoria(id)
+            # Lotes grandes reordenam os índices ordenados uma vez só em vez de inserir livro a livro
+            em_lote = len(operacao['livros']) > self.tamanho_lote
+            for livro in operacao['livros']:
+                self._remove_da_memoria(livro['id'])
+                self.livros[livro['id']] = livro
+                self._indexa(livro, ordenados=not em_lote)
+            if em_lote:
+                self._reconstroi_ordenados()
+        elif operacao['op'] == 'remove':
+            for id in operacao['ids']:
+                self._remove_da_memoria(id)
+
+    def _remove_da_memoria(self, id):
+        livro = self.livros.pop(id, None)
+        if livro is not None:
+            self.por_autor.get(livro['autor'], set()).discard(id)
+            self.por_genero.get(livro['genero'], set()).discard(id)
+            if livro['ano'] is not None:
+                posicao = bisect_left(self.por_ano, (livro['ano'], id))
+                if posicao < len(self.por_ano) and self.por_ano[posicao] == (livro['ano'], id):
+                    del self.por_ano[posicao]
+            else:
+                posicao = bisect_left(self.sem_ano, id)
+                if posicao < len(self.sem_ano) and self.sem_ano[posicao] == id:
+                    del self.sem_ano[posicao]
+            posicao = bisect_left(self.ids_ordenados, id)
+            if posicao < len(self.ids_ordenados) and self.ids_ordenados[posicao] == id:
+                del self.ids_ordenados[posicao]
+
+    def _indexa(self, livro, ordenados=True):
+        self.por_autor.setdefault(livro['autor'], set()).add(livro['id'])
+        self.por_genero.setdefault(livro['genero'], set()).add(livro['id'])
+        if ordenados:
+            insort(self.ids_ordenados, livro['id'])
+            if livro['ano'] is not None:
+                insort(self.por_ano, (livro['ano'], livro['id']))
+            else:
+                insort(self.sem_ano, livro['id'])
+
+    def _reconstroi_ordenados(self):
+        # Lista ordenada de (ano, id): faixas de ano saem por busca binária.
+        # ids_ordenados serve o itera: a página seguinte começa por busca binária no último id enviado.
+        self.por_ano = sorted((livro['ano'], livro['id']) for livro in self.livros.values() if livro['ano'] is not None)
+        self.sem_ano = sorted(id for id, livro in self.livros.items() if livro['ano'] is None)
+        self.ids_ordenados = sorted(self.livros)
+
+    def _registra(self, operacao):
+        # A escrita só é confirmada depois que a linha está no disco
+        self._saida_journal.write(json.dumps(operacao, ensure_ascii=False) + '\n')
+        self._saida_journal.flush()
+        os.fsync(self._saida_journal.fileno())
+        self._aplica(operacao)
+        self._pendentes += 1
+        if self._pendentes >= self.tamanho_lote:
+            self._acorda.set()
+
+    def existe(self, id):
+        self.recarrega_se_alterado()
+        return id in self.livros
+
+    def obtem(self, id):
+        self.recarrega_se_alterado()
+        return self.livros.get(id)
+
+    def todos(self):
+        self.recarrega_se_alterado()
+        return list(self.livros.values())
+
+    def do_autor(self, autor):
+        self.recarrega_se_alterado()
+        return [self.livros[id] for id in sorted(self.por_autor.get(autor, ()))]
+
+    def do_genero(self, genero):
+        self.recarrega_se_alterado()
+        return [self.livros[id] for id in sorted(self.por_genero.get(genero, ()))]
+
+    def filtra(self, autor=None, genero=None, ano_min=None, ano_max=None, ordem='id', apos=None, limite=None):
+        self.recarrega_se_alterado()
+        campo, reverso = valida_ordem(ordem)
+        with self._trava:
+            conjuntos = []
+            if autor is not None:
+                conjuntos.append(self.por_autor.get(autor, set()))
+            if genero is not None:
+                conjuntos.append(self.por_genero.get(genero, set()))
+            faixa_ano = ano_min is not None or ano_max is not None
+
+            # Ordem por ano ou por id sem outro filtro que a restrinja: a página sai andando no índice já
+            # ordenado a partir do cursor, e o custo é o tamanho da página, não o do resultado
+            if campo == 'ano' and not conjuntos:
+                return self._coleta(self._ids_por_ano(ano_min, ano_max, reverso, apos), [], limite)
+            if campo == 'id' and not conjuntos and not faixa_ano:
+                return self._coleta(self._ids_por_id(reverso, apos), [], limite)
+
+            if faixa_ano:
+                inicio, fim = self._faixa_ano(ano_min, ano_max)
+                conjuntos.append({id for _, id in self.por_ano[inicio:fim]})
+            if conjuntos:
+                # Começa pelo menor conjunto para a interseção custar o mínimo
+                conjuntos.sort(key=len)
+                ids = set(conjuntos[0]).intersection(*conjuntos[1:])
+                livros = [self.livros[id] for id in ids]
+            else:
+                livros = list(self.livros.values())
+
+        return ordena_livros(livros, campo, reverso, apos, limite)
+
+    def _coleta(self, ids, conjuntos, limite):
+        livros = []
+        for id in ids:
+            if limite is not None and len(livros) >= limite:
+                break
+            if all(id in conjunto for conjunto in conjuntos):
+                livros.append(self.livros[id])
+        return livros
+
+    def _faixa_ano(self, ano_min, ano_max):
+        inicio = 0 if ano_min is None else bisect_left(self.por_ano, (ano_min,))
+        fim = len(self.por_ano) if ano_max is None else bisect_left(self.por_ano, (ano_max + 1,))
+        return inicio, fim
+
+    def _ids_por_id(self, reverso, apos):
+        if not reverso:
+            inicio = 0 if apos is None else bisect_right(self.ids_ordenados, apos[1])
+            for posicao in range(inicio, len(self.ids_ordenados)):
+                yield self.ids_ordenados[posicao]
+        else:
+            fim = len(self.ids_ordenados) if apos is None else bisect_left(self.ids_ordenados, apos[1])
+            for posicao in range(fim - 1, -1, -1):
+                yield self.ids_ordenados[posicao]
+
+    def _ids_por_ano(self, ano_min, ano_max, reverso, apos):
+        # por_ano já está em (ano, id) crescente. No decrescente os anos são percorridos de trás para frente,
+        # mas cada ano em ids crescentes, como no ordena_livros. Os livros sem ano vêm no fim, por id, e só
+        # quando não há faixa de ano
+        inicio, fim = self._faixa_ano(ano_min, ano_max)
+        valor, id_cursor = apos if apos is not None else (None, None)
+        if apos is None or valor is not None:
+            if not reverso:
+                if apos is not None:
+                    inicio = max(inicio, bisect_right(self.por_ano, (valor, id_cursor)))
+                for posicao in range(inicio, fim):
+                    yield self.por_ano[posicao][1]
+            else:
+                topo = fim
+                if apos is not None:
+                    # O resto do ano do cursor e depois os anos menores
+                    topo = max(inicio, min(fim, bisect_left(self.por_ano, (valor,))))
+                    for posicao in range(max(inicio, bisect_right(self.por_ano, (valor, id_cursor))), min(fim, bisect_left(self.por_ano, (valor + 1,)))):
+                        yield self.por_ano[posicao][1]
+                while topo > inicio:
+                    base = max(inicio, bisect_left(self.por_ano, (self.por_ano[topo - 1][0],)))
+                    for posicao in range(base, topo):
+                        yield self.por_ano[posicao][1]
+                    topo = base
+        if ano_min is None and ano_max is None:
+            comeco = bisect_right(self.sem_ano, id_cursor) if apos is not None and valor is None else 0
+            for posicao in range(comeco, len(self.sem_ano)):
+                yield self.sem_ano[posicao]
+
+    def itera(self, apos=None, limite=None):
+        # Lê do estado em memória, que já tem o journal aplicado, então não precisa esperar a compactação do XML.
+        # Cada bloco pega a trava só para copiar as referências; escritas no meio do streaming entram ou não
+        # conforme o id delas esteja antes ou depois do ponto em que a leitura está.
+        self.recarrega_se_alterado()
+        enviados = 0
+        while limite is None or enviados < limite:
+            tamanho = self.TAMANHO_LOTE_LEITURA if limite is None else min(self.TAMANHO_LOTE_LEITURA, limite - enviados)
+            with self._trava:
+                inicio = 0 if apos is None else bisect_right(self.ids_ordenados, apos)
+                bloco = [self.livros[id] for id in self.ids_ordenados[inicio:inicio + tamanho]]
+            if not bloco:
+                return
+            yield from bloco
+            enviados += len(bloco)
+            apos = bloco[-1]['id']
+
+    def adiciona(self, livro):
+        self.recarrega_se_alterado()
+        with self._trava:
+            if livro['id'] in self.livros:
+                raise ValueError(f'ID {livro["id"]} já está sendo utilizado')
+            self._registra({'op': 'salva', 'livros': [livro]})
+
+    def adiciona_lote(self, livros):
+        # Valida todo o lote contra um conjunto de ids e grava tudo numa única operação do journal
+        self.recarrega_se_alterado()
+        with self._trava:
+            vistos = set()
+            conflitos = set()
+            for livro in livros:
+                id = livro['id']
+                if id in vistos or id in self.livros:
+                    conflitos.add(id)
+                vistos.add(id)
+            if conflitos:
+                raise ValueError(sorted(conflitos))
+            if livros:
+                self._registra({'op': 'salva', 'livros': livros})
+
+    def atualiza(self, id, livro):
+        self.recarrega_se_alterado()
+        with self._trava:
+            if id not in self.livros:
+                raise KeyError(id)
+            if livro['id'] != id and livro['id'] in self.livros:
+                raise ValueError(f'ID {livro["id"]} já está sendo utilizado')
+            # Troca de id vai numa única operação para não perder o livro se cair no meio
+            self._registra({'op': 'salva', 'ids': [id], 'livros': [livro]})
+
+    def remove(self, id):
+        self.recarrega_se_alterado()
+        with self._trava:
+            if id not in self.livros:
+                raise KeyError(id)
+            livro = self.livros[id]
+            self._registra({'op': 'remove', 'ids': [id]})
+            return livro
+
+    def compacta(self):
+        with self._trava_compactacao:
+            self._compacta()
+
+    def _compacta(self):
+        # Troca o journal por um novo e tira uma cópia do estado sob a trava; o XML é escrito fora dela
+        with self._trava:
+            if self._pendentes == 0:
+                return
+            # No Windows um arquivo aberto não pode ser renomeado nem apagado: fecha o journal antes de mexer nele
+            self._saida_journal.close()
+            try:
+                if os.path.exists(self._journal_compactando):
+                    # Sobrou de uma compactação interrompida: o estado em memória já inclui essas operações
+                    with open(self._journal_compactando, 'a', encoding='utf-8') as destino, open(self.journal, 'r', encoding='utf-8') as origem:
+                        destino.write(origem.read())
+                    os.remove(self.journal)
+                else:
+                    os.replace(self.journal, self._journal_compactando)
+            finally:
+                self._saida_journal = open(self.journal, 'a', encoding='utf-8')
+            livros = list(self.livros.values())
+            pendentes = self._pendentes
+            self._pendentes = 0
+
+        temporario = self.arquivo + '.tmp'
+        try:
+            with open(temporario, 'w', encoding='utf-8') as saida:
+                saida.write('<livros>\n')
+                saida.writelines(livro_para_xml(livro) for livro in livros)
+                saida.write('</livros>')
+                saida.flush()
+                os.fsync(saida.fileno())
+
+            with self._trava:
+                os.replace(temporario, self.arquivo)
+                os.remove(self._journal_compactando)
+                self._assinatura = self._assinatura_arquivo()
+        except OSError:
+            # O journal .compactando continua no disco; a próxima tentativa junta o journal novo nele e reescreve o XML
+            with self._trava:
+                self._pendentes += pendentes
+            raise
+
+    def _loop_compactacao(self):
+        while not self._parar.is_set():
+            self._acorda.wait(self.intervalo_compactacao)
+            self._acorda.clear()
+            try:
+                self.compacta()
+            except Exception:
+                # Disco cheio, livros.xml preso por outro processo etc.: a thread segue viva e tenta de novo no próximo ciclo
+                log.exception('Falha ao compactar %s; nova tentativa em %ss', self.arquivo, self.intervalo_compactacao)
+
+    def fecha(self):
+        self._parar.set()
+        self._acorda.set()
+        self._compactador.join()
+        self.compacta()
+        self._saida_journal.close()
+
+class RepositorioLivrosSQLite(ArmazenamentoLivros):
+    # Mesma interface do RepositorioLivros, guardando os livros num arquivo SQLite com índices por autor, ano e gênero
+
+    # Limite de parâmetros por consulta em versões antigas do SQLite
+    TAMANHO_LOTE_IDS = 900
+
+    def __init__(self, arquivo='livros.db'):
+        self.arquivo = arquivo
+        self._trava = threading.Lock()
+        self._conexao = self._conecta()
+        with self._conexao:
+            self._conexao.execute('''
+                CREATE TABLE IF NOT EXISTS livros (
+                    id INTEGER PRIMARY KEY,
+                    titulo TEXT NOT NULL,
+                    autor TEXT NOT NULL,
+                    ano INTEGER,
+                    genero TEXT NOT NULL
+                )''')
+            self._conexao.execute('CREATE INDEX IF NOT EXISTS idx_livros_autor ON livros (autor)')
+            self._conexao.execute('CREATE INDEX IF NOT EXISTS idx_livros_ano ON livros (ano)')
+            self._conexao.execute('CREATE INDEX IF NOT EXISTS idx_livros_genero ON livros (genero)')
+
+    def _conecta(self):
+        conexao = sqlite3.connect(self.arquivo, check_same_thread=False)
+        conexao.row_factory = sqlite3.Row
+        # WAL permite leituras em paralelo com a escrita
+        conexao.execute('PRAGMA journal_mode=WAL')
+        conexao.execute('PRAGMA synchronous=NORMAL')
+        return conexao
+
+    def _consulta(self, sql, parametros=()):
+        with self._trava:
+            return [dict(linha) for linha in self._conexao.execute(sql, parametros)]
+
+    def existe(self, id):
+        return self.obtem(id) is not None
+
+    def obtem(self, id):
+        linhas = self._consulta('SELECT * FROM livros WHERE id = ?', (id,))
+        return linhas[0] if linhas else None
+
+    def todos(self):
+        return self._consulta('SELECT * FROM livros ORDER BY id')
+
+    def do_autor(self, autor):
+        return self._consulta('SELECT * FROM livros WHERE autor = ? ORDER BY id', (autor,))
+
+    def do_genero(self, genero):
+        return self._consulta('SELECT * FROM livros WHERE genero = ? ORDER BY id', (genero,))
+
+    def filtra(self, autor=None, genero=None, ano_min=None, ano_max=None, ordem='id', apos=None, limite=None):
+        campo, reverso = valida_ordem(ordem)
+        condicoes, parametros = [], []
+        for sql, valor in (('autor = ?', autor), ('genero = ?', genero), ('ano >= ?', ano_min), ('ano <= ?', ano_max)):
+            if valor is not None:
+                condicoes.append(sql)
+                parametros.append(valor)
+        # campo já foi validado contra CAMPOS_ORDEM, então pode entrar no SQL
+        if apos is not None:
+            valor, id = apos
+            if valor is None:
+                condicoes.append(f'{campo} IS NULL AND id > ?')
+                parametros.append(id)
+            else:
+                comparacao = '<' if reverso else '>'
+                condicoes.append(f'({campo} IS NULL OR {campo} {comparacao} ? OR ({campo} = ? AND id > ?))')
+                parametros.extend([valor, valor, id])
+        where = f'WHERE {" AND ".join(condicoes)}' if condicoes else ''
+        direcao = 'DESC' if reverso else 'ASC'
+        parametros.append(-1 if limite is None else limite)
+        return self._consulta(f'SELECT * FROM livros {where} ORDER BY {campo} IS NULL, {campo} {direcao}, id LIMIT ?', parametros)
+
+    def itera(self, apos=None, limite=None):
+        # Conexão própria para a leitura em streaming não segurar a trava durante a resposta inteira
+        conexao = self._conecta()
+        try:
+            where, parametros = ('', []) if apos is None else ('WHERE id > ?', [apos])
+            cursor = conexao.execute(f'SELECT * FROM livros {where} ORDER BY id LIMIT ?', parametros + [-1 if limite is None else limite])
+            while linhas := cursor.fetchmany(self.TAMANHO_LOTE_LEITURA):
+                yield from (dict(linha) for linha in linhas)
+        finally:
+            conexao.close()
+
+    def adiciona(self, livro):
+        self.adiciona_lote([livro])
+
+    def adiciona_lote(self, livros):
+        ids = [livro['id'] for livro in livros]
+        with self._trava:
+            vistos = set()
+            conflitos = set()
+            for id in ids:
+                if id in vistos:
+                    conflitos.add(id)
+                vistos.add(id)
+            for inicio in range(0, len(ids), self.TAMANHO_LOTE_IDS):
+                bloco = ids[inicio:inicio + self.TAMANHO_LOTE_IDS]
+                marcadores = ','.join('?' * len(bloco))
+                conflitos.update(linha[0] for linha in self._conexao.execute(f'SELECT id FROM livros WHERE id IN ({marcadores})', bloco))
+            if conflitos:
+                raise ValueError(sorted(conflitos))
+            with self._conexao:
+                self._conexao.executemany(
+                    'INSERT INTO livros (id, titulo, autor, ano, genero) VALUES (:id, :titulo, :autor, :ano, :genero)', livros)
+
+    def atualiza(self, id, livro):
+        with self._trava:
+            try:
+                with self._conexao:
+                    alterados = self._conexao.execute(
+                        'UPDATE livros SET id = :id, titulo = :titulo, autor = :autor, ano = :ano, genero = :genero WHERE id = :id_antigo',
+                        {**livro, 'id_antigo': id}).rowcount
+            except sqlite3.IntegrityError:
+                raise ValueError(f'ID {livro["id"]} já está sendo utilizado')
+            if alterados == 0:
+                raise KeyError(id)
+
+    def remove(self, id):
+        with self._trava:
+            with self._conexao:
+                linha = self._conexao.execute('DELETE FROM livros WHERE id = ? RETURNING *', (id,)).fetchone()
+            if linha is None:
+                raise KeyError(id)
+            return dict(linha)
+
+    def fecha(self):
+        self._conexao.close()
+
+def abre_armazenamento(tipo='xml', arquivo=None):
+    if tipo == 'sqlite':
+        return RepositorioLivrosSQLite(arquivo or 'livros.db')
+    if tipo == 'xml':
+        return RepositorioLivros(arquivo or 'livros.xml')
+    raise ValueError(f'Armazenamento desconhecido: {tipo}')
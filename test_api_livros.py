@@ -0,0 +1,57 @@
+import importlib.util
+import os
+import pytest
+from fastapi.testclient import TestClient
+
+PASTA = os.path.dirname(os.path.abspath(__file__))
+
+@pytest.fixture
+def cliente(tmp_path, monkeypatch):
+    # Atvd 4.py abre o armazenamento no import: o banco fica na pasta temporária do teste
+    monkeypatch.setenv('LIVROS_ARMAZENAMENTO', 'sqlite')
+    monkeypatch.setenv('LIVROS_ARQUIVO', str(tmp_path / 'livros.db'))
+    spec = importlib.util.spec_from_file_location('atvd_4', os.path.join(PASTA, 'Atvd 4.py'))
+    modulo = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(modulo)
+    yield TestClient(modulo.app)
+    modulo.repositorio.fecha()
+
+@pytest.mark.parametrize('corpo', [b'not json', b'[1,', b'\xff\xfe', b'{"id": 1}\n{"id": 2, "titulo": ', b'[{"id": "x"}]'])
+def test_lote_invalido_devolve_422(cliente, corpo):
+    resposta = cliente.post('/livros/lote', content=corpo)
+    assert resposta.status_code == 422
+    assert all('input' not in erro for erro in resposta.json()['detail'])
+
+def test_lote_valido(cliente):
+    corpo = b'{"id": 1, "titulo": "T", "autor": "A", "ano": 2000, "genero": "G"}\n'
+    assert cliente.post('/livros/lote', content=corpo).json() == {'inseridos': 1}
+    assert cliente.post('/livros/lote', content=corpo).status_code == 409
+
+def percorre(cliente, **parametros):
+    livros, cursor = [], None
+    while True:
+        resposta = cliente.get('/livros', params={**parametros, **({'cursor': cursor} if cursor else {})})
+        assert resposta.status_code == 200
+        livros.extend(int(id) for id in resposta.json())
+        cursor = resposta.headers.get('X-Proximo-Cursor')
+        if cursor is None:
+            return livros
+
+def test_paginacao_por_cursor(cliente):
+    cliente.post('/livros/lote', content=b''.join(
+        b'{"id": %d, "titulo": "T%d", "autor": "%s", "ano": %d, "genero": "G"}\n' % (id, id % 3, b'AB'[id % 2:id % 2 + 1], 1990 + id % 4)
+        for id in range(1, 21)))
+    for parametros in ({}, {'ordem': '-ano'}, {'autor': 'A', 'ordem': 'titulo'}, {'ano_min': 1991, 'ordem': '-id'}):
+        completo = [int(id) for id in cliente.get('/livros', params=parametros).json()]
+        assert percorre(cliente, limit=3, **parametros) == completo
+
+    # O livro do cursor some entre uma página e outra: a próxima página continua de onde parou
+    resposta = cliente.get('/livros', params={'autor': 'A', 'ordem': '-ano', 'limit': 2})
+    ultimo = list(resposta.json())[-1]
+    assert cliente.delete(f'/livros/{ultimo}').status_code == 200
+    seguinte = cliente.get('/livros', params={'autor': 'A', 'ordem': '-ano', 'limit': 2, 'cursor': resposta.headers['X-Proximo-Cursor']})
+    assert seguinte.status_code == 200 and ultimo not in seguinte.json()
+
+@pytest.mark.parametrize('parametros', [{'cursor': 'lixo'}, {'cursor': 'WyJhIiwgMV0', 'ordem': 'ano'}, {'ordem': 'editora'}])
+def test_paginacao_parametros_invalidos(cliente, parametros):
+    assert cliente.get('/livros', params=parametros).status_code == 400
@@ -0,0 +1,201 @@
+import os
+import pytest
+from bench_livros import gera_xml
+from repositorio_livros import RepositorioLivros, RepositorioLivrosSQLite
+
+# Os dois armazenamentos do Atvd 4.py rodam o mesmo roteiro: qualquer diferença de comportamento falha aqui
+
+LIVROS = [
+    {'id': 1, 'titulo': 'C', 'autor': 'A', 'ano': 2000, 'genero': 'G'},
+    {'id': 2, 'titulo': 'A', 'autor': 'B', 'ano': 1990, 'genero': 'G'},
+    {'id': 3, 'titulo': 'B', 'autor': 'A', 'ano': None, 'genero': 'H'},
+    {'id': 4, 'titulo': 'D', 'autor': 'A', 'ano': 1990, 'genero': 'G'},
+    {'id': 5, 'titulo': 'E', 'autor': 'B', 'ano': 2010, 'genero': 'H'},
+]
+
+def abre_xml(pasta):
+    arquivo = os.path.join(pasta, 'livros.xml')
+    if not os.path.exists(arquivo):
+        gera_xml(arquivo, 0)
+    # Compactação só no fecha: as escritas ficam no journal durante o teste
+    return RepositorioLivros(arquivo, intervalo_compactacao=3600)
+
+def abre_sqlite(pasta):
+    return RepositorioLivrosSQLite(os.path.join(pasta, 'livros.db'))
+
+def simula_queda(repositorio):
+    # Para o processo sem fecha(): nada de compactação final, só o que já foi confirmado em disco
+    if isinstance(repositorio, RepositorioLivros):
+        repositorio._parar.set()
+        repositorio._acorda.set()
+        repositorio._compactador.join()
+        repositorio._saida_journal.close()
+    else:
+        repositorio._conexao.close()
+
+@pytest.fixture(params=[abre_xml, abre_sqlite], ids=['xml', 'sqlite'])
+def abre(request, tmp_path):
+    abertos = []
+    def abre():
+        repositorio = request.param(str(tmp_path))
+        abertos.append(repositorio)
+        return repositorio
+    yield abre
+    for repositorio in abertos:
+        try:
+            repositorio.fecha()
+        except Exception:
+            pass
+
+@pytest.fixture
+def repositorio(abre):
+    repositorio = abre()
+    repositorio.adiciona_lote([dict(livro) for livro in LIVROS])
+    return repositorio
+
+def ids(livros):
+    return [livro['id'] for livro in livros]
+
+def test_adiciona_e_obtem(abre):
+    repositorio = abre()
+    livro = {'id': 1, 'titulo': 'T', 'autor': 'A', 'ano': 2000, 'genero': 'G'}
+    repositorio.adiciona(livro)
+    assert repositorio.existe(1) and repositorio.obtem(1) == livro
+    assert not repositorio.existe(2) and repositorio.obtem(2) is None
+
+@pytest.mark.parametrize('lote', [[LIVROS[0]], [{**LIVROS[1], 'id': 9}, {**LIVROS[1], 'id': 9}]])
+def test_lote_com_id_repetido_nao_grava_nada(repositorio, lote):
+    with pytest.raises(ValueError):
+        repositorio.adiciona_lote(lote)
+    assert ids(repositorio.todos()) == [1, 2, 3, 4, 5]
+
+def test_indices_por_autor_e_genero(repositorio):
+    assert ids(repositorio.do_autor('A')) == [1, 3, 4]
+    assert ids(repositorio.do_genero('H')) == [3, 5]
+    assert repositorio.do_autor('Z') == []
+
+def test_atualiza_trocando_id(repositorio):
+    repositorio.atualiza(3, {**LIVROS[2], 'id': 6, 'autor': 'B'})
+    assert not repositorio.existe(3) and repositorio.obtem(6)['autor'] == 'B'
+    assert ids(repositorio.do_autor('A')) == [1, 4]
+    with pytest.raises(KeyError):
+        repositorio.atualiza(99, LIVROS[0])
+    with pytest.raises(ValueError):
+        repositorio.atualiza(1, {**LIVROS[0], 'id': 2})
+
+def test_remove(repositorio):
+    assert repositorio.remove(4)['id'] == 4
+    assert ids(repositorio.itera()) == [1, 2, 3, 5]
+    assert ids(repositorio.filtra(ano_min=1990, ano_max=1990)) == [2]
+    with pytest.raises(KeyError):
+        repositorio.remove(4)
+
+def test_itera_com_cursor_por_id(repositorio):
+    assert ids(repositorio.itera()) == [1, 2, 3, 4, 5]
+    assert ids(repositorio.itera(2, 2)) == [3, 4]
+    assert ids(repositorio.itera(5)) == []
+    repositorio.remove(3)
+    # O cursor continua válido mesmo se o livro dele sumiu
+    assert ids(repositorio.itera(3)) == [4, 5]
+
+@pytest.mark.parametrize('filtros, esperado', [
+    ({}, [1, 2, 3, 4, 5]),
+    ({'autor': 'A'}, [1, 3, 4]),
+    ({'autor': 'A', 'genero': 'G'}, [1, 4]),
+    ({'ano_min': 1995}, [1, 5]),
+    ({'ano_max': 1999}, [2, 4]),
+    ({'ano_min': 1990, 'ano_max': 2000}, [1, 2, 4]),
+    ({'ano_min': 2001, 'ano_max': 2005}, []),
+    ({'autor': 'B', 'ano_min': 2000}, [5]),
+    ({'ordem': 'ano'}, [2, 4, 1, 5, 3]),
+    ({'ordem': '-ano'}, [5, 1, 2, 4, 3]),
+    ({'ordem': 'titulo'}, [2, 3, 1, 4, 5]),
+    ({'ordem': '-id', 'genero': 'G'}, [4, 2, 1]),
+    ({'ordem': '-ano', 'ano_max': 2000, 'autor': 'A'}, [1, 4]),
+])
+def test_filtra(repositorio, filtros, esperado):
+    assert ids(repositorio.filtra(**filtros)) == esperado
+
+def chave_cursor(livro, ordem):
+    return livro[(ordem or 'id').lstrip('-')], livro['id']
+
+def pagina_tudo(repositorio, limite, ordem=None, **filtros):
+    livros, apos = [], None
+    while True:
+        pagina = repositorio.filtra(ordem=ordem, apos=apos, limite=limite, **filtros)
+        livros.extend(pagina)
+        if len(pagina) < limite:
+            return livros
+        apos = chave_cursor(pagina[-1], ordem)
+
+@pytest.mark.parametrize('ordem', [None, '-id', 'ano', '-ano', 'titulo', '-autor'])
+@pytest.mark.parametrize('filtros', [{}, {'autor': 'A'}, {'ano_min': 1990}, {'ano_max': 2000, 'genero': 'G'}])
+@pytest.mark.parametrize('limite', [1, 2, 3])
+def test_filtra_paginado_igual_ao_completo(repositorio, ordem, filtros, limite):
+    repositorio.adiciona_lote([
+        {'id': 6, 'titulo': 'C', 'autor': 'A', 'ano': 1990, 'genero': 'G'},
+        {'id': 7, 'titulo': 'F', 'autor': 'B', 'ano': None, 'genero': 'G'},
+        {'id': 8, 'titulo': 'A', 'autor': 'A', 'ano': 2010, 'genero': 'H'},
+    ])
+    assert ids(pagina_tudo(repositorio, limite, ordem, **filtros)) == ids(repositorio.filtra(ordem=ordem, **filtros))
+
+@pytest.mark.parametrize('ordem', ['ano', '-ano', 'titulo'])
+def test_filtra_cursor_de_livro_removido_ou_alterado(repositorio, ordem):
+    primeira = repositorio.filtra(autor='A', ordem=ordem, limite=2)
+    resto = ids(repositorio.filtra(autor='A', ordem=ordem))[2:]
+    ultimo = primeira[-1]
+    apos = chave_cursor(ultimo, ordem)
+    repositorio.atualiza(ultimo['id'], {**ultimo, 'autor': 'Z'})
+    assert ids(repositorio.filtra(autor='A', ordem=ordem, apos=apos)) == resto
+    repositorio.remove(ultimo['id'])
+    assert ids(repositorio.filtra(autor='A', ordem=ordem, apos=apos)) == resto
+
+def test_filtra_ordem_invalida(repositorio):
+    with pytest.raises(ValueError):
+        repositorio.filtra(ordem='editora')
+
+def test_escritas_sobrevivem_a_queda(abre):
+    repositorio = abre()
+    repositorio.adiciona_lote([dict(livro) for livro in LIVROS])
+    repositorio.atualiza(1, {**LIVROS[0], 'titulo': 'Novo'})
+    repositorio.remove(2)
+    simula_queda(repositorio)
+
+    reaberto = abre()
+    assert ids(reaberto.itera()) == [1, 3, 4, 5]
+    assert reaberto.obtem(1)['titulo'] == 'Novo'
+    assert ids(reaberto.filtra(ano_min=1990, ano_max=1990)) == [4]
+
+def test_journal_com_linha_cortada(tmp_path):
+    repositorio = abre_xml(str(tmp_path))
+    repositorio.adiciona(dict(LIVROS[0]))
+    simula_queda(repositorio)
+    # Queda no meio da escrita da próxima operação: a linha nunca foi confirmada
+    with open(repositorio.journal, 'a', encoding='utf-8') as journal:
+        journal.write('{"op": "salva", "livros": [{"id": 2')
+
+    reaberto = abre_xml(str(tmp_path))
+    assert ids(reaberto.itera()) == [1]
+    reaberto.adiciona(dict(LIVROS[1]))
+    simula_queda(reaberto)
+
+    assert ids(abre_xml(str(tmp_path)).itera()) == [1, 2]
+
+def test_queda_no_meio_da_compactacao(tmp_path):
+    repositorio = abre_xml(str(tmp_path))
+    repositorio.adiciona_lote([dict(livro) for livro in LIVROS[:3]])
+    simula_queda(repositorio)
+    # Journal já renomeado para .compactando, mas o XML novo não chegou a ser gravado
+    os.replace(repositorio.journal, repositorio._journal_compactando)
+
+    reaberto = abre_xml(str(tmp_path))
+    reaberto.adiciona(dict(LIVROS[3]))
+    assert ids(reaberto.itera()) == [1, 2, 3, 4]
+    reaberto.fecha()
+    assert not os.path.exists(reaberto._journal_compactando)
+
+    # Depois da compactação tudo está no próprio XML
+    os.remove(reaberto.journal)
+    final = abre_xml(str(tmp_path))
+    assert ids(final.itera()) == [1, 2, 3, 4]
+    final.fecha()
@@ -0,0 +1,60 @@
+import io
+import json
+import logging
+import pytest
+from validador_json import em_lotes, le_registros, novo_relatorio, registra_lote, valida_lote, valida_paralelo
+
+TIPOS = {'nome': str, 'temperatura_media': float}
+
+def gera_registros(total):
+    # Nomes com ',{},' e ',{' enganam o palpite de fronteira dos shards do array
+    return [{
+        'nome': [f'x,{{}},y{i}', f'a,{{"nome": {i}}}', 'São Paulo', f'b", {{"x": {i}}}, {{'][i % 4],
+        'temperatura_media': 1.5 if i % 7 else 'quente',
+    } for i in range(total)]
+
+def abre_logger(nome, nivel):
+    saida = io.StringIO()
+    logger = logging.getLogger(nome)
+    logger.handlers[:] = [logging.StreamHandler(saida)]
+    logger.propagate = False
+    logger.setLevel(nivel)
+    return logger, saida
+
+def valida_serial(arquivo, logger):
+    relatorio = novo_relatorio()
+    for lote in em_lotes(le_registros(arquivo)):
+        _, invalidos = valida_lote(lote, TIPOS, relatorio)
+        registra_lote(logger, lote, invalidos)
+    return relatorio
+
+@pytest.fixture(params=['json', 'jsonl'])
+def arquivo(request, tmp_path):
+    registros = gera_registros(400)
+    caminho = tmp_path / f'capitais.{request.param}'
+    with open(caminho, 'w', encoding='utf-8') as saida:
+        if request.param == 'json':
+            json.dump({'capitais': registros}, saida, ensure_ascii=False)
+        else:
+            saida.writelines(json.dumps(registro, ensure_ascii=False) + '\n' for registro in registros)
+    return str(caminho)
+
+@pytest.mark.parametrize('nivel', [logging.INFO, logging.WARNING])
+@pytest.mark.parametrize('tamanho_shard', [64, 256, 1 << 20])
+def test_paralelo_igual_ao_serial(arquivo, nivel, tamanho_shard):
+    logger, saida = abre_logger('serial', nivel)
+    serial = valida_serial(arquivo, logger)
+    logger, saida_paralelo = abre_logger('paralelo', nivel)
+    paralelo = valida_paralelo(arquivo, TIPOS, logger, processos=2, tamanho_shard=tamanho_shard)
+
+    assert saida_paralelo.getvalue() == saida.getvalue()
+    for campo in ('validos', 'invalidos', 'erros_por_campo'):
+        assert paralelo[campo] == serial[campo]
+    assert paralelo['validos'] == 342
+
+def test_array_sem_fechamento(tmp_path):
+    caminho = tmp_path / 'cortado.json'
+    caminho.write_text('{"capitais": [{"nome": "a"}, {"nome": "b"}', encoding='utf-8')
+    logger, _ = abre_logger('cortado', logging.WARNING)
+    with pytest.raises(ValueError):
+        valida_paralelo(str(caminho), TIPOS, logger, processos=2, tamanho_shard=8)
@@ -0,0 +1,380 @@
+import codecs
+import json
+import logging
+import os
+import re
+import time
+from collections import Counter, deque
+from concurrent.futures import ProcessPoolExecutor
+
+TAMANHO_LOTE = 10_000
+TAMANHO_BLOCO = 1 << 20
+EXTENSOES_JSONL = ('.jsonl', '.ndjson')
+TAMANHO_SHARD = 64 * 2**20
+MAX_AMOSTRAS = 10
+
+# Nomes aceitos no formatter_json do config.yaml
+TIPOS = {
+    'string': str,
+    'str': str,
+    'int': int,
+    'float': float,
+    'bool': bool,
+    'list': list,
+    'dict': dict,
+}
+
+def compila_formato(formatter_json):
+    # Converte o formatter_json uma vez só em {chave: tipo}; a validação vira type(valor) is tipo,
+    # o mesmo critério do type(valor).__name__ do Atvd 5.py (bool não passa como int, int não passa como float)
+    try:
+        return {chave: TIPOS[tipo] for chave, tipo in formatter_json.items()}
+    except KeyError as e:
+        raise ValueError(f'Tipo desconhecido no formatter_json: {e.args[0]}')
+
+def campos_invalidos(registro, tipos):
+    # Chave fora do formatter_json também conta como inválida (tipos.get devolve None)
+    return [chave for chave, valor in registro.items() if type(valor) is not tipos.get(chave)]
+
+def novo_relatorio():
+    return {'validos': 0, 'invalidos': 0, 'erros_por_campo': Counter(), 'warnings': 0, 'infos': 0, 'amostras': []}
+
+def junta_relatorios(destino, origem, max_amostras=MAX_AMOSTRAS):
+    for campo in ('validos', 'invalidos', 'warnings', 'infos'):
+        destino[campo] += origem[campo]
+    destino['erros_por_campo'].update(origem['erros_por_campo'])
+    destino['amostras'].extend(origem['amostras'][:max_amostras - len(destino['amostras'])])
+    return destino
+
+def valida_lote(registros, tipos, relatorio=None):
+    # Valida um lote e separa os registros válidos dos inválidos (com a posição no lote e os campos problemáticos)
+    relatorio = relatorio if relatorio is not None else novo_relatorio()
+    erros_por_campo = relatorio['erros_por_campo']
+    validos, invalidos = [], []
+    amostras = relatorio['amostras']
+    # Caminho rápido: para cada ordem de chaves já vista guarda a tupla de tipos esperada
+    # e compara a tupla de tipos do registro de uma vez
+    esperados = {}
+    for indice, registro in enumerate(registros):
+        chaves = tuple(registro)
+        esperado = esperados.get(chaves)
+        if esperado is None:
+            esperado = esperados[chaves] = tuple(tipos.get(chave) for chave in chaves)
+        if tuple(map(type, registro.values())) == esperado:
+            validos.append(registro)
+            continue
+        campos = campos_invalidos(registro, tipos)
+        erros_por_campo.update(campos)
+        invalidos.append((indice, registro, campos))
+        if len(amostras) < MAX_AMOSTRAS:
+            amostras.append({'registro': registro, 'campos': campos})
+    relatorio['invalidos'] += len(invalidos)
+    relatorio['validos'] += len(validos)
+    return validos, invalidos
+
+def registros_em_ordem(lote, invalidos, com_validos=True):
+    # (registro, campos) na ordem do lote, como o laço original registrava: campos vazio para os válidos,
+    # que só entram com com_validos (nível INFO)
+    if not com_validos:
+        return [(registro, campos) for _, registro, campos in invalidos]
+    campos_por_indice = {indice: campos for indice, _, campos in invalidos}
+    return [(registro, campos_por_indice.get(indice, ())) for indice, registro in enumerate(lote)]
+
+def mensagens_registro(registro, campos):
+    # Um warning por campo inválido ou, se não houver nenhum, o info do registro
+    if campos:
+        return [(logging.WARNING, 'Erro no registro: %s - Dado inválido: %s', (registro, chave)) for chave in campos]
+    return [(logging.INFO, 'Processando registro: %s', (registro,))]
+
+def registra_lote(logger, lote, invalidos):
+    for registro, campos in registros_em_ordem(lote, invalidos, logger.isEnabledFor(logging.INFO)):
+        for nivel, mensagem, argumentos in mensagens_registro(registro, campos):
+            logger.log(nivel, mensagem, *argumentos)
+
+def em_lotes(registros, tamanho_lote=TAMANHO_LOTE):
+    lote = []
+    for registro in registros:
+        lote.append(registro)
+        if len(lote) >= tamanho_lote:
+            yield lote
+            lote = []
+    if lote:
+        yield lote
+
+def formata_relatorio(relatorio):
+    linhas = [f'Registros válidos: {relatorio["validos"]}', f'Registros inválidos: {relatorio["invalidos"]}']
+    for campo, total in relatorio['erros_por_campo'].most_common():
+        linhas.append(f'  {campo}: {total}')
+    for amostra in relatorio['amostras']:
+        linhas.append(f'  Exemplo inválido: {amostra["registro"]} - campos: {", ".join(amostra["campos"])}')
+    return '\n'.join(linhas)
+
+def le_jsonl(arquivo):
+    with open(arquivo, 'r', encoding='utf-8') as entrada:
+        for linha in entrada:
+            if linha.strip():
+                yield json.loads(linha)
+
+def le_array_streaming(arquivo, chave='capitais', tamanho_bloco=TAMANHO_BLOCO):
+    # Lê o array data[chave] item por item com JSONDecoder.raw_decode sobre um buffer de tamanho limitado,
+    # sem carregar o arquivo inteiro. Espera que os itens sejam objetos (um objeto cortado no fim do buffer
+    # sempre falha no raw_decode, então basta ler mais um bloco e tentar de novo).
+    decodificador = json.JSONDecoder()
+    marcador = f'"{chave}"'
+    with open(arquivo, 'r', encoding='utf-8') as entrada:
+        buffer = ''
+        while True:
+            bloco = entrada.read(tamanho_bloco)
+            buffer += bloco
+            inicio_chave = buffer.find(marcador)
+            inicio_array = buffer.find('[', inicio_chave) if inicio_chave >= 0 else -1
+            if inicio_array >= 0:
+                buffer = buffer[inicio_array + 1:]
+                break
+            if not bloco:
+                raise ValueError(f'Array "{chave}" não encontrado em {arquivo}')
+            if inicio_chave < 0:
+                # Guarda só o suficiente para achar a chave se ela estiver partida entre dois blocos
+                buffer = buffer[-len(marcador):]
+
+        posicao = 0
+        while True:
+            while posicao < len(buffer) and buffer[posicao] in ' \t\r\n,':
+                posicao += 1
+            if posicao < len(buffer) and buffer[posicao] == ']':
+                return
+            try:
+                if posicao >= len(buffer):
+                    raise json.JSONDecodeError('Fim do buffer', buffer, posicao)
+                registro, posicao = decodificador.raw_decode(buffer, posicao)
+            except json.JSONDecodeError:
+                bloco = entrada.read(tamanho_bloco)
+                if not bloco:
+                    raise
+                buffer = buffer[posicao:] + bloco
+                posicao = 0
+                continue
+            yield registro
+            if posicao >= tamanho_bloco:
+                buffer = buffer[posicao:]
+                posicao = 0
+
+def le_registros(arquivo, chave='capitais'):
+    # JSON Lines (um registro por linha) ou um documento com o array em data[chave]
+    if arquivo.lower().endswith(EXTENSOES_JSONL):
+        return le_jsonl(arquivo)
+    return le_array_streaming(arquivo, chave)
+
+def faixas_bytes(arquivo, inicio=0, tamanho_shard=TAMANHO_SHARD):
+    tamanho = os.path.getsize(arquivo)
+    return [(posicao, min(posicao + tamanho_shard, tamanho)) for posicao in range(inicio, tamanho, tamanho_shard)]
+
+def le_faixa_jsonl(arquivo, inicio, fim):
+    # Cada linha pertence ao shard em que ela começa: pula a linha parcial do início e
+    # lê a última linha até o fim mesmo que passe do limite
+    with open(arquivo, 'rb') as entrada:
+        if inicio > 0:
+            entrada.seek(inicio - 1)
+            entrada.readline()
+        while entrada.tell() < fim:
+            linha = entrada.readline()
+            if not linha:
+                break
+            if linha.strip():
+                yield json.loads(linha)
+
+def inicio_array(arquivo, chave='capitais', tamanho_bloco=TAMANHO_BLOCO):
+    # Posição em bytes logo depois do '[' de data[chave], procurada do mesmo jeito que no le_array_streaming
+    marcador = f'"{chave}"'.encode('utf-8')
+    with open(arquivo, 'rb') as entrada:
+        buffer, deslocamento = b'', 0
+        while True:
+            bloco = entrada.read(tamanho_bloco)
+            buffer += bloco
+            inicio_chave = buffer.find(marcador)
+            inicio = buffer.find(b'[', inicio_chave) if inicio_chave >= 0 else -1
+            if inicio >= 0:
+                return deslocamento + inicio + 1
+            if not bloco:
+                raise ValueError(f'Array "{chave}" não encontrado em {arquivo}')
+            if inicio_chave < 0:
+                corte = max(len(buffer) - len(marcador), 0)
+                buffer, deslocamento = buffer[corte:], deslocamento + corte
+
+# Quanto uma faixa começada por palpite pode ler além do próprio fim antes de desistir do palpite
+MAX_ALEM_DA_FAIXA = 4 * TAMANHO_BLOCO
+ESPACOS = re.compile(r'[ \t\r\n]*')
+INICIO_ITEM = re.compile(r',[ \t\r\n]*\{')
+
+class _TextoFaixa:
+    # Texto de uma faixa de bytes do arquivo que cresce bloco a bloco quando um item passa do fim dela
+    def __init__(self, entrada, dados, tamanho_bloco, maximo=None):
+        self.entrada = entrada
+        self.tamanho_bloco = tamanho_bloco
+        self.maximo = maximo  # em caracteres; None lê até o fim do arquivo se precisar
+        self.leitor = codecs.getincrementaldecoder('utf-8')()
+        self.texto = self.leitor.decode(dados)
+        self.decodificador = json.JSONDecoder()
+
+    def mais(self):
+        if self.maximo is not None and len(self.texto) >= self.maximo:
+            return False
+        bloco = self.entrada.read(self.tamanho_bloco)
+        self.texto += self.leitor.decode(bloco, final=not bloco)
+        return bool(bloco)
+
+    def pula_espacos(self, posicao):
+        # Devolve a posição do próximo caractere que não é espaço, ou len(texto) no fim do arquivo
+        while True:
+            posicao = ESPACOS.match(self.texto, posicao).end()
+            if posicao < len(self.texto) or not self.mais():
+                return posicao
+
+    def decodifica(self, posicao):
+        while True:
+            try:
+                return self.decodificador.raw_decode(self.texto, posicao)
+            except json.JSONDecodeError as erro:
+                # Objeto cortado no fim do texto: lê mais um bloco. Erro no meio do texto é JSON inválido
+                cortado = erro.pos >= len(self.texto) - 16 or erro.msg.startswith('Unterminated')
+                if not cortado or not self.mais():
+                    raise
+
+def le_faixa_array(arquivo, inicio, fim, exato, tamanho_bloco=TAMANHO_BLOCO):
+    # Itens do array que começam na faixa [inicio, fim) de bytes, lidos pelo próprio processo filho.
+    # Com exato, inicio é uma fronteira de item conhecida; sem, a fronteira é um palpite: o primeiro ',{' da
+    # faixa que decodifica como objeto seguido de ',' ou ']'. Devolve (início em bytes do primeiro item ou None
+    # se não houver palpite, início em bytes do próximo item ou None no fim do array, registros)
+    registros = []
+    with open(arquivo, 'rb') as entrada:
+        entrada.seek(inicio)
+        dados = entrada.read(fim - inicio)
+        corte = 0
+        while not exato and corte < len(dados) and dados[corte] & 0xC0 == 0x80:
+            # Faixa começando no meio de um caractere UTF-8
+            corte += 1
+        inicio += corte
+        faixa = _TextoFaixa(entrada, dados[corte:], tamanho_bloco)
+        # Itens a partir deste caractere começam em fim ou depois e são do próximo shard
+        limite = len(faixa.texto)
+        if not exato:
+            # Um palpite errado (dentro de uma string) não pode sair lendo o arquivo até o fim
+            faixa.maximo = limite + MAX_ALEM_DA_FAIXA
+
+        posicao = 0
+        if not exato:
+            posicao = None
+            for candidato in INICIO_ITEM.finditer(faixa.texto, 0, limite):
+                try:
+                    _, depois = faixa.decodifica(candidato.end() - 1)
+                except json.JSONDecodeError:
+                    continue
+                depois = faixa.pula_espacos(depois)
+                if faixa.texto[depois:depois + 1] in (',', ']'):
+                    posicao = candidato.end() - 1
+                    break
+            if posicao is None:
+                return None, None, registros
+
+        primeiro = inicio + len(faixa.texto[:posicao].encode('utf-8'))
+        while True:
+            posicao = faixa.pula_espacos(posicao)
+            if posicao >= len(faixa.texto):
+                raise ValueError(f'Array sem "]" no fim de {arquivo}')
+            caractere = faixa.texto[posicao]
+            if caractere == ']':
+                return primeiro, None, registros
+            if caractere == ',':
+                posicao += 1
+                continue
+            if posicao >= limite:
+                return primeiro, inicio + len(faixa.texto[:posicao].encode('utf-8')), registros
+            registro, posicao = faixa.decodifica(posicao)
+            registros.append(registro)
+
+def _valida_shard(registros, tipos, nivel, max_amostras):
+    # Roda no processo filho: valida e devolve o relatório do shard com os eventos de log já na ordem dos registros.
+    # Os eventos levam só o texto de cada registro que vai para o log (todos em INFO, só os inválidos em
+    # WARNING) e os nomes dos campos inválidos; os registros em si não voltam para o processo pai
+    relatorio = novo_relatorio()
+    eventos = []
+    for lote in em_lotes(registros):
+        validos, invalidos = valida_lote(lote, tipos, relatorio)
+        del relatorio['amostras'][max_amostras:]
+        relatorio['warnings'] += sum(len(campos) for _, _, campos in invalidos)
+        if nivel <= logging.INFO:
+            relatorio['infos'] += len(validos)
+        if nivel <= logging.WARNING:
+            em_ordem = registros_em_ordem(lote, invalidos, nivel <= logging.INFO)
+            eventos.append((time.time(), [(str(registro), campos) for registro, campos in em_ordem]))
+    return relatorio, eventos
+
+def _valida_faixa_jsonl(tarefa):
+    arquivo, inicio, fim, tipos, nivel, max_amostras = tarefa
+    return _valida_shard(le_faixa_jsonl(arquivo, inicio, fim), tipos, nivel, max_amostras)
+
+def _valida_faixa_array(tarefa):
+    arquivo, inicio, fim, exato, tipos, nivel, max_amostras = tarefa
+    try:
+        primeiro, proximo, registros = le_faixa_array(arquivo, inicio, fim, exato)
+    except ValueError:
+        if exato:
+            raise
+        # Palpite que passou na conferência do primeiro item mas quebrou depois (ex.: ',{},' dentro de uma
+        # string): volta sem início para o processo pai refazer a faixa a partir da fronteira confirmada
+        return None, None, novo_relatorio(), []
+    return (primeiro, proximo) + _valida_shard(registros, tipos, nivel, max_amostras)
+
+def _resultados_array(pool, arquivo, chave, tipos, nivel, max_amostras, janela, tamanho_shard=TAMANHO_SHARD):
+    # Confere o palpite de fronteira de cada shard com o início exato do próximo item que o shard anterior
+    # devolveu. Palpite errado (um ',{' dentro de uma string) só custa validar a faixa de novo neste processo
+    inicio = inicio_array(arquivo, chave)
+    faixas = faixas_bytes(arquivo, inicio, tamanho_shard)
+    tarefas = ((arquivo, comeco, fim, comeco == inicio, tipos, nivel, max_amostras) for comeco, fim in faixas)
+    esperado = inicio
+    for (comeco, fim), resultado in zip(faixas, _mapa_limitado(pool, _valida_faixa_array, tarefas, janela)):
+        if esperado is None or esperado >= fim:
+            # O array já acabou, ou nenhum item começa nesta faixa (um item maior que o shard)
+            continue
+        if resultado[0] != esperado:
+            resultado = _valida_faixa_array((arquivo, esperado, fim, True, tipos, nivel, max_amostras))
+        esperado = resultado[1]
+        yield resultado[2:]
+    if esperado is not None:
+        raise ValueError(f'Array sem "]" no fim de {arquivo}')
+
+def _mapa_limitado(pool, funcao, tarefas, janela):
+    # Como pool.map, mas só mantém 'janela' shards em andamento: Executor.map consome todas as tarefas de uma vez,
+    # o que carregaria o array inteiro na memória
+    pendentes = deque()
+    for tarefa in tarefas:
+        pendentes.append(pool.submit(funcao, tarefa))
+        if len(pendentes) >= janela:
+            yield pendentes.popleft().result()
+    while pendentes:
+        yield pendentes.popleft().result()
+
+def valida_paralelo(arquivo, tipos, logger=None, processos=None, chave='capitais', max_amostras=MAX_AMOSTRAS, tamanho_shard=TAMANHO_SHARD):
+    # JSONL e array são divididos em faixas de bytes que cada processo lê e decodifica sozinho; no array a
+    # fronteira de cada faixa é conferida com o fim da anterior (_resultados_array).
+    # Os shards voltam na ordem em que foram enviados e só o processo pai escreve no log, então o arquivo sai em ordem.
+    logger = logger or logging.getLogger()
+    nivel = logger.getEffectiveLevel()
+    janela = 2 * (processos or os.cpu_count() or 1)
+
+    relatorio = novo_relatorio()
+    with ProcessPoolExecutor(max_workers=processos) as pool:
+        if arquivo.lower().endswith(EXTENSOES_JSONL):
+            tarefas = ((arquivo, inicio, fim, tipos, nivel, max_amostras) for inicio, fim in faixas_bytes(arquivo, 0, tamanho_shard))
+            resultados = _mapa_limitado(pool, _valida_faixa_jsonl, tarefas, janela)
+        else:
+            resultados = _resultados_array(pool, arquivo, chave, tipos, nivel, max_amostras, janela, tamanho_shard)
+        for parcial, eventos in resultados:
+            junta_relatorios(relatorio, parcial, max_amostras)
+            for criado, registros in eventos:
+                for texto, campos in registros:
+                    for nivel_evento, mensagem, argumentos in mensagens_registro(texto, campos):
+                        evento = logger.makeRecord(logger.name, nivel_evento, arquivo, 0, mensagem, argumentos, None)
+                        evento.created, evento.msecs = criado, (criado - int(criado)) * 1000
+                        logger.handle(evento)
+    return relatorio